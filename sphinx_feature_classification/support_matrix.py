@@ -19,154 +19,902 @@ It is used via a single directive in the .rst file
 
 """
 
+import array
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Sequence
+from collections.abc import Set
+from concurrent import futures
 import configparser
+import csv
+import filecmp
+import hashlib
+import json
+import multiprocessing
+from multiprocessing import shared_memory
+import os
 from os import path
+import pickle
 import re
+import struct
+import threading
 from typing import Any
+from typing import cast
+from typing import ClassVar
+from typing import overload
+import urllib.parse
+from xml.sax import saxutils
 
 from docutils import nodes
 from docutils.parsers import rst
+from sphinx import addnodes
 import sphinx.application
+from sphinx.builders import Builder
+from sphinx.domains import Domain
+from sphinx.domains import ObjType
+from sphinx.environment import BuildEnvironment
+from sphinx.roles import XRefRole
 from sphinx.util.fileutil import copy_asset
+from sphinx.util import logging
+from sphinx.util.nodes import make_refnode
+from sphinx.util.parallel import parallel_available
+
+LOG = logging.getLogger(__name__)
 
 KEY_PATTERN = re.compile("[^a-zA-Z0-9_]")
 DRIVER_PREFIX = "driver."
 FEATURE_PREFIX = 'operation.'
 DRIVER_NOTES_PREFIX = "driver-notes."
+SUMMARY_LAYOUTS = ('auto', 'transposed', 'chunked')
+SUMMARY_CHUNK_SIZE = 20
+SPARKLINE_SYMBOLS = "\u2581\u2582\u2583\u2584\u2585\u2586\u2587\u2588"
 
 
 class Matrix:
     """Represents the entire support matrix for project drivers"""
 
+    drivers: 'dict[str, Driver]'
+    features: 'Sequence[Feature]'
+
     def __init__(self, cfg: configparser.ConfigParser) -> None:
         self.drivers = self._set_drivers(cfg)
         self.features = self._set_features(cfg)
 
-    @staticmethod
-    def _set_drivers(cfg: configparser.ConfigParser) -> 'dict[str, Driver]':
+    @classmethod
+    def _set_drivers(
+        cls, cfg: configparser.ConfigParser
+    ) -> 'dict[str, Driver]':
         drivers = {}
 
         for section in cfg.sections():
             if not section.startswith(DRIVER_PREFIX):
                 continue
 
-            title = cfg.get(section, "title")
+            drivers[section] = cls._process_driver(cfg, section)
 
-            link = None
-            if cfg.has_option(section, 'link'):
-                link = cfg.get(section, "link")
+        return drivers
 
-            driver = Driver(title, link)
-            drivers[section] = driver
+    @staticmethod
+    def _process_driver(
+        cfg: configparser.ConfigParser, section: str
+    ) -> 'Driver':
+        title = cfg.get(section, "title")
 
-        return drivers
+        link = None
+        if cfg.has_option(section, 'link'):
+            link = cfg.get(section, "link")
+
+        return Driver(title, link)
 
     def _set_features(self, cfg: configparser.ConfigParser) -> list['Feature']:
         features = []
 
-        def _process_feature(section: str) -> Feature:
-            if not cfg.has_option(section, "title"):
-                raise Exception(
-                    f"'title' option missing in '[{section}]' section"
-                )
+        for section in cfg.sections():
+            if not section.startswith(FEATURE_PREFIX):
+                continue
 
-            title = cfg.get(section, "title")
-            status = Feature.STATUS_OPTIONAL
-            group = None
+            features.append(self._process_feature_section(cfg, section))
 
-            if cfg.has_option(section, "status"):
-                # The value is a string "status(group)" where
-                # the 'group' part is optional
-                match = re.match(
-                    r'^([^(]+)(?:\(([^)]+)\))?$', cfg.get(section, "status")
-                )
-                if match is None:
-                    raise ValueError(
-                        "Invalid 'status': {}".format(
-                            cfg.get(section, "status")
-                        )
-                    )
+        return features
 
-                status, group = match.groups()
+    def _process_feature_section(
+        self, cfg: configparser.ConfigParser, section: str
+    ) -> 'Feature':
+        feature = self._process_feature(cfg, section)
 
-                if status not in Feature.STATUS_ALL:
-                    raise ValueError(
-                        "'status' option value '{}' in ['{}']"
-                        "section must be one of ({})".format(
-                            status, section, ", ".join(Feature.STATUS_ALL)
-                        )
-                    )
+        # Now we've got the basic feature details, we must process
+        # the backend driver implementation for each feature
+        for option in cfg.options(section):
+            if not option.startswith(DRIVER_PREFIX):
+                continue
 
-            cli = None
-            if cfg.has_option(section, "cli"):
-                cli = cfg.get(section, "cli")
-
-            api = None
-            if cfg.has_option(section, "api"):
-                api = cfg.get(section, "api")
-
-            notes = None
-            if cfg.has_option(section, "notes"):
-                notes = cfg.get(section, "notes")
-
-            return Feature(
-                section,
-                title,
-                status=status,
-                group=group,
-                notes=notes,
-                cli=cli,
-                api=api,
-            )
+            self._process_implementation(cfg, section, option, feature)
+
+        return feature
 
-        def _process_implementation(
-            section: str, option: str, feature: 'Feature'
-        ) -> 'Feature':
-            if option not in self.drivers:
-                raise Exception(
-                    f"'{option}' section is not declared in the INI file."
+    @staticmethod
+    def _process_feature(
+        cfg: configparser.ConfigParser, section: str
+    ) -> 'Feature':
+        if not cfg.has_option(section, "title"):
+            raise Exception(f"'title' option missing in '[{section}]' section")
+
+        title = cfg.get(section, "title")
+        status = Feature.STATUS_OPTIONAL
+        group = None
+
+        if cfg.has_option(section, "status"):
+            # The value is a string "status(group)" where
+            # the 'group' part is optional
+            match = re.match(
+                r'^([^(]+)(?:\(([^)]+)\))?$', cfg.get(section, "status")
+            )
+            if match is None:
+                raise ValueError(
+                    "Invalid 'status': {}".format(cfg.get(section, "status"))
                 )
 
-            status = cfg.get(section, option)
-            if status not in Implementation.STATUS_ALL:
+            status, group = match.groups()
+
+            if status not in Feature.STATUS_ALL:
                 raise ValueError(
-                    "{} is set to {} in '[{}]' section but must be "
-                    "one of ({})".format(
-                        option,
-                        status,
-                        section,
-                        ", ".join(Implementation.STATUS_ALL),
+                    "'status' option value '{}' in ['{}']"
+                    "section must be one of ({})".format(
+                        status, section, ", ".join(Feature.STATUS_ALL)
                     )
                 )
 
-            option_notes = ''.join(
-                [DRIVER_NOTES_PREFIX, option[len(DRIVER_PREFIX) :]]
+        cli = None
+        if cfg.has_option(section, "cli"):
+            cli = cfg.get(section, "cli")
+
+        api = None
+        if cfg.has_option(section, "api"):
+            api = cfg.get(section, "api")
+
+        notes = None
+        if cfg.has_option(section, "notes"):
+            notes = cfg.get(section, "notes")
+
+        return Feature(
+            section,
+            title,
+            status=status,
+            group=group,
+            notes=notes,
+            cli=cli,
+            api=api,
+        )
+
+    def _process_implementation(
+        self,
+        cfg: configparser.ConfigParser,
+        section: str,
+        option: str,
+        feature: 'Feature',
+    ) -> 'Feature':
+        if option not in self.drivers:
+            raise Exception(
+                f"'{option}' section is not declared in the INI file."
+            )
+
+        status = cfg.get(section, option)
+        if status not in Implementation.STATUS_ALL:
+            raise ValueError(
+                "{} is set to {} in '[{}]' section but must be "
+                "one of ({})".format(
+                    option,
+                    status,
+                    section,
+                    ", ".join(Implementation.STATUS_ALL),
+                )
             )
-            notes = None
-            if cfg.has_option(section, option_notes):
-                notes = cfg.get(section, option_notes)
 
-            impl = Implementation(status=status, notes=notes)
-            feature.implementations[option] = impl
+        option_notes = ''.join(
+            [DRIVER_NOTES_PREFIX, option[len(DRIVER_PREFIX) :]]
+        )
+        notes = None
+        if cfg.has_option(section, option_notes):
+            notes = cfg.get(section, option_notes)
 
-            return feature
+        impl = Implementation(status=status, notes=notes)
+        feature.implementations[option] = impl
+
+        return feature
+
+    def _update_sections(
+        self,
+        cfg: configparser.ConfigParser,
+        driver_order: list[str],
+        feature_order: list[str],
+    ) -> None:
+        """Patch the matrix with re-parsed sections.
 
+        :param cfg: Parser holding only the sections which changed
+        :param driver_order: All driver sections, in file order
+        :param feature_order: All feature sections, in file order
+        """
+        # Parse everything before touching the matrix so that it is left
+        # as is if one of the sections is invalid.
+        drivers = {}
+        features = {}
         for section in cfg.sections():
-            if not section.startswith(FEATURE_PREFIX):
+            if section.startswith(DRIVER_PREFIX):
+                drivers[section] = self._process_driver(cfg, section)
+            elif section.startswith(FEATURE_PREFIX):
+                features[section] = self._process_feature_section(cfg, section)
+
+        for key, driver in drivers.items():
+            self.drivers[key].title = driver.title
+            self.drivers[key].link = driver.link
+
+        if list(self.drivers) != driver_order:
+            current = dict(self.drivers)
+            self.drivers.clear()
+            self.drivers.update((key, current[key]) for key in driver_order)
+
+        current_features = {feature.key: feature for feature in self.features}
+        current_features.update(features)
+        self.features = [current_features[key] for key in feature_order]
+
+    def materialize(self) -> 'Matrix':
+        """Return a matrix holding all of its features.
+
+        Matrices which decode their features on access, such as
+        SharedMatrix, decode them all once so that walking the features
+        repeatedly does not decode them again.
+        """
+        return self
+
+    def coverage(self, driver: str) -> float | None:
+        """Return the share of features implemented by a driver.
+
+        Complete implementations count fully and partial implementations
+        count half. Returns None if the driver is not part of the matrix.
+        """
+        if driver not in self.drivers:
+            return None
+        return _coverage(
+            (
+                feature.implementations[driver].status
+                for feature in self.features
+                if driver in feature.implementations
+            ),
+            len(self.features),
+        )
+
+
+def _coverage(statuses: Iterable[str], total: int) -> float:
+    if not total:
+        return 0.0
+
+    score = 0.0
+    for status in statuses:
+        if status == Implementation.STATUS_COMPLETE:
+            score += 1
+        elif status == Implementation.STATUS_PARTIAL:
+            score += 0.5
+    return score / total
+
+
+def _split_sections(text: str) -> tuple[str, dict[str, str]] | None:
+    """Split the text of an INI file into its sections.
+
+    Section headers are recognized the same way configparser does, so that
+    a header followed by a comment is a header too.
+
+    :returns: The text preceding the first section and the text of each
+        section keyed by name, or None if the file can't be safely split,
+        for example because a section is declared twice.
+    """
+    preamble = text
+    sections = {}
+    name = None
+    start = offset = 0
+    for line in text.splitlines(keepends=True):
+        match = configparser.ConfigParser.SECTCRE.match(line.strip())
+        if match:
+            if line[:1].isspace():
+                # configparser treats it as a header or as the continuation
+                # of a value depending on the lines before
+                return None
+            if name is None:
+                preamble = text[:offset]
+            else:
+                sections[name] = text[start:offset]
+            name = match.group('header')
+            if name in sections:
+                return None
+            start = offset
+        offset += len(line)
+
+    if name is not None:
+        sections[name] = text[start:]
+
+    return preamble, sections
+
+
+class _CachedMatrix:
+    def __init__(
+        self,
+        stat: tuple[int, int],
+        preamble: str,
+        hashes: dict[str, str],
+        matrix: Matrix,
+    ) -> None:
+        self.stat = stat
+        self.preamble = preamble
+        self.hashes = hashes
+        self.matrix = matrix
+        self.lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state['lock']
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+
+class MatrixCache:
+    """Cache of parsed support matrices.
+
+    Along with the Matrix, the hash of each section of the INI file is
+    kept. When the file changes, only the driver and feature sections whose
+    hash changed are parsed and validated again, and the cached Matrix is
+    patched in place. The whole file is parsed again if anything else
+    changes, such as the set of drivers or the DEFAULT section.
+
+    The cache can be saved to and restored from a file, so that it outlives
+    the process and benefits successive builds.
+    """
+
+    VERSION = 1
+
+    def __init__(self) -> None:
+        self._entries: dict[str, _CachedMatrix] = {}
+        self._lock = threading.Lock()
+
+    def get(self, fpath: str) -> Matrix | None:
+        """Return the cached matrix of a file if the file is unchanged."""
+        fpath = path.abspath(fpath)
+        st = os.stat(fpath)
+
+        with self._lock:
+            entry = self._entries.get(fpath)
+
+        if entry is None:
+            return None
+        with entry.lock:
+            if entry.stat != (st.st_mtime_ns, st.st_size):
+                return None
+            return entry.matrix
+
+    def load(self, fpath: str) -> Matrix:
+        fpath = path.abspath(fpath)
+        st = os.stat(fpath)
+        stat = (st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            entry = self._entries.get(fpath)
+
+        if entry is not None:
+            with entry.lock:
+                if entry.stat == stat:
+                    return entry.matrix
+                if self._update(fpath, entry, stat):
+                    return entry.matrix
+
+        with open(fpath) as fp:
+            text = fp.read()
+        cfg = configparser.ConfigParser()
+        cfg.read_string(text, source=fpath)
+        matrix = Matrix(cfg)
+
+        split = _split_sections(text)
+        if split is not None and cfg.sections() == [
+            name for name in split[1] if name != cfg.default_section
+        ]:
+            preamble, sections = split
+            hashes = {
+                name: self._hash(section) for name, section in sections.items()
+            }
+            with self._lock:
+                self._entries[fpath] = _CachedMatrix(
+                    stat, preamble, hashes, matrix
+                )
+
+        return matrix
+
+    def _update(
+        self, fpath: str, entry: _CachedMatrix, stat: tuple[int, int]
+    ) -> bool:
+        """Re-parse the changed sections of a cached matrix.
+
+        :returns: False if the file must be parsed in full instead.
+        """
+        with open(fpath) as fp:
+            text = fp.read()
+
+        split = _split_sections(text)
+        if split is None:
+            return False
+        preamble, sections = split
+        if preamble.strip() != entry.preamble.strip():
+            return False
+
+        hashes = {
+            name: self._hash(section) for name, section in sections.items()
+        }
+        changed = [
+            name for name in hashes if entry.hashes.get(name) != hashes[name]
+        ]
+        removed = entry.hashes.keys() - hashes.keys()
+
+        for name in [*changed, *removed]:
+            if name.startswith(FEATURE_PREFIX):
                 continue
+            # an existing driver may change, but adding or removing one
+            # affects the validation of every feature
+            if (
+                name.startswith(DRIVER_PREFIX)
+                and name in entry.hashes
+                and name in hashes
+            ):
+                continue
+            return False
 
-            feature = _process_feature(section)
+        cfg = configparser.ConfigParser()
+        if changed:
+            # DEFAULT values apply to every section
+            default = sections.get(cfg.default_section, '')
+            cfg.read_string(
+                default + ''.join(sections[name] for name in changed),
+                source=fpath,
+            )
 
-            # Now we've got the basic feature details, we must process
-            # the backend driver implementation for each feature
-            for option in cfg.options(section):
-                if not option.startswith(DRIVER_PREFIX):
-                    continue
+        entry.matrix._update_sections(
+            cfg,
+            [name for name in sections if name.startswith(DRIVER_PREFIX)],
+            [name for name in sections if name.startswith(FEATURE_PREFIX)],
+        )
 
-                _process_implementation(section, option, feature)
-            features.append(feature)
+        entry.stat = stat
+        entry.preamble = preamble
+        entry.hashes = hashes
+        return True
+
+    def load_many(
+        self, fpaths: list[str], max_workers: int | None = None
+    ) -> list[Matrix]:
+        """Load many matrices, parsing the changed files concurrently.
+
+        Parsing is CPU bound, so the files which are not cached or which
+        changed are parsed in forked worker processes. The workers start
+        with a copy of the cache, so they only parse the sections which
+        changed, and send back the entries for the files they parsed.
+        Files are parsed in this process if workers can't be forked or if
+        a worker fails, so that errors are raised from here.
+
+        :param max_workers: Maximum number of worker processes, defaults
+            to the number of CPUs
+        """
+        fpaths = [path.abspath(fpath) for fpath in fpaths]
+        matrices = {fpath: self.get(fpath) for fpath in fpaths}
+        pending = [
+            fpath for fpath, matrix in matrices.items() if matrix is None
+        ]
+        workers = min(len(pending), max_workers or os.cpu_count() or 1)
+
+        if parallel_available and workers > 1:
+            with futures.ProcessPoolExecutor(
+                workers,
+                mp_context=multiprocessing.get_context('fork'),
+                initializer=_init_worker,
+                initargs=(self,),
+            ) as executor:
+                jobs = {
+                    fpath: executor.submit(_load_in_worker, fpath)
+                    for fpath in pending
+                }
+                for fpath, job in jobs.items():
+                    try:
+                        matrix, entry = job.result()
+                    except Exception as exc:
+                        LOG.debug('parsing %s again: %s', fpath, exc)
+                        continue
+                    if entry is not None:
+                        with self._lock:
+                            self._entries[fpath] = entry
+                    matrices[fpath] = matrix
+
+        loaded = {
+            fpath: self.load(fpath) if matrix is None else matrix
+            for fpath, matrix in matrices.items()
+        }
+        return [loaded[fpath] for fpath in fpaths]
+
+    def save(self, fpath: str) -> None:
+        """Save the cached matrices to a file."""
+        with self._lock:
+            entries = dict(self._entries)
+
+        tmp = f"{fpath}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as fp:
+            pickle.dump(
+                (self.VERSION, entries), fp, protocol=pickle.HIGHEST_PROTOCOL
+            )
+        os.replace(tmp, fpath)
+
+    def restore(self, fpath: str) -> None:
+        """Restore the matrices saved to a file.
+
+        Matrices already cached are kept. A missing or unreadable file is
+        ignored, as the matrices are then parsed in full.
+        """
+        try:
+            with open(fpath, 'rb') as fp:
+                version, entries = pickle.load(fp)  # noqa: S301
+        except FileNotFoundError:
+            return
+        except Exception as exc:
+            LOG.debug('ignoring support matrix cache %s: %s', fpath, exc)
+            return
+
+        if version != self.VERSION:
+            return
+
+        with self._lock:
+            for key, entry in entries.items():
+                self._entries.setdefault(key, entry)
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha256(text.encode()).hexdigest()
+
+
+_MATRIX_CACHE = MatrixCache()
+MATRIX_CACHE_FILENAME = 'support-matrix-cache.pickle'
+
+
+# the cache of the worker processes of MatrixCache.load_many
+_WORKER_CACHE: MatrixCache | None = None
 
-        return features
+
+def _init_worker(cache: MatrixCache) -> None:
+    global _WORKER_CACHE
+    # the workers are forked, so this is the copy of the cache that
+    # started them
+    _WORKER_CACHE = cache
+
+
+def _load_in_worker(fpath: str) -> tuple[Matrix, _CachedMatrix | None]:
+    """Load a matrix in a worker process of MatrixCache.load_many.
+
+    :returns: The matrix and its cache entry, if it can be cached
+    """
+    cache = cast(MatrixCache, _WORKER_CACHE)
+    matrix = cache.load(fpath)
+    with cache._lock:
+        entry = cache._entries.get(fpath)
+    if entry is None or entry.matrix is not matrix:
+        return matrix, None
+    return matrix, entry
+
+
+def driver_summary(matrix: Matrix, key: str) -> dict[str, Any]:
+    """Summarize the support of the features of a matrix by a driver.
+
+    :param matrix: The support matrix
+    :param key: The key of the driver in the matrix
+    :returns: A dict which can be serialized to JSON
+    """
+    driver = matrix.drivers[key]
+    statuses = dict.fromkeys(Implementation.STATUS_ALL, 0)
+    features = {}
+    for feature in matrix.features:
+        impl = feature.implementations.get(key)
+        if impl is None:
+            continue
+        statuses[impl.status] += 1
+        features[feature.key] = impl.status
+
+    return {
+        'driver': key,
+        'title': driver.title,
+        'link': driver.link,
+        'coverage': round(matrix.coverage(key) or 0.0, 4),
+        'statuses': statuses,
+        'features': features,
+    }
+
+
+def load_support_matrix(fpath: str) -> Matrix:
+    """Parse a support-matrix.ini file.
+
+    Matrices are cached for the lifetime of the process and only the
+    sections which changed are parsed again when the file is modified.
+
+    :param fpath: Path to the INI file
+    :returns: Matrix instance
+    """
+    shared = _get_shared_matrix(fpath)
+    if shared is not None:
+        return shared
+
+    return _MATRIX_CACHE.load(fpath)
+
+
+def load_support_matrices(
+    fpaths: list[str], max_workers: int | None = None
+) -> list[Matrix]:
+    """Parse many support-matrix.ini files concurrently.
+
+    The files which are neither shared nor cached are parsed in worker
+    processes, see MatrixCache.load_many.
+
+    :param fpaths: Paths to the INI files
+    :param max_workers: Maximum number of worker processes
+    :returns: Matrix instances, in the same order as the files
+    """
+    shared = {fpath: _get_shared_matrix(fpath) for fpath in fpaths}
+    loaded = iter(
+        _MATRIX_CACHE.load_many(
+            [fpath for fpath in fpaths if shared[fpath] is None], max_workers
+        )
+    )
+    matrices: list[Matrix] = []
+    for fpath in fpaths:
+        matrix = shared[fpath]
+        matrices.append(next(loaded) if matrix is None else matrix)
+    return matrices
+
+
+def _get_shared_matrix(fpath: str) -> 'SharedMatrix | None':
+    """Return a matrix shared by the parent process, if it is up to date."""
+    shared = _SHARED_MATRICES.get(path.abspath(fpath))
+    if shared is None or os.getpid() == shared[0]:
+        return None
+
+    stat, shm = shared[1], shared[2]
+    st = os.stat(fpath)
+    if stat != (st.st_mtime_ns, st.st_size):
+        return None
+    return SharedMatrix(cast(memoryview, shm.buf))
+
+
+SHARED_MATRIX_MAGIC = b'SMX2'
+_SHARED_MATRIX_HEADER = struct.Struct('=4sIII')
+# key, title, status, group, notes, cli, api, number of implementations
+_SHARED_FEATURE_SIZE = 8
+# driver, status, notes
+_SHARED_IMPLEMENTATION_SIZE = 3
+
+# fpath -> (owner pid, stat, shared memory) of the matrices shared with the
+# parallel readers
+_SHARED_MATRICES: dict[
+    str, tuple[int, tuple[int, int], shared_memory.SharedMemory]
+] = {}
+
+
+def _encode_matrix(matrix: Matrix) -> bytes:
+    """Encode a matrix in a compact binary form.
+
+    All strings go to a string table and everything else, including
+    references to strings and status codes, to an array of integers. The
+    array starts with the drivers, followed by the position of each feature
+    in the array so that features can be decoded individually.
+    """
+    strings: dict[str, int] = {}
+    ints = array.array('i')
+
+    def _string(value: str | None) -> int:
+        if value is None:
+            return -1
+        return strings.setdefault(value, len(strings))
+
+    drivers = {key: idx for idx, key in enumerate(matrix.drivers)}
+    ints.append(len(drivers))
+    for key, driver in matrix.drivers.items():
+        ints.extend(
+            [_string(key), _string(driver.title), _string(driver.link)]
+        )
+
+    ints.append(len(matrix.features))
+    index = len(ints)
+    ints.extend([0] * len(matrix.features))
+    for idx, feature in enumerate(matrix.features):
+        ints[index + idx] = len(ints)
+        ints.extend(
+            [
+                _string(feature.key),
+                _string(feature.title),
+                Feature.STATUS_ALL.index(feature.status),
+                _string(feature.group),
+                _string(feature.notes),
+                _string(feature.cli),
+                _string(feature.api),
+                len(feature.implementations),
+            ]
+        )
+        for key, impl in feature.implementations.items():
+            ints.extend(
+                [
+                    drivers[key],
+                    Implementation.STATUS_ALL.index(impl.status),
+                    _string(impl.notes),
+                ]
+            )
+
+    blobs = [value.encode() for value in strings]
+    offsets = array.array('I', [0])
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+
+    return b''.join(
+        [
+            _SHARED_MATRIX_HEADER.pack(
+                SHARED_MATRIX_MAGIC, len(blobs), len(ints), offsets[-1]
+            ),
+            offsets.tobytes(),
+            ints.tobytes(),
+            *blobs,
+        ]
+    )
+
+
+class SharedMatrix(Matrix):
+    """A support matrix read from its encoded form, see _encode_matrix.
+
+    The matrix is a view of the buffer holding the encoded form, typically
+    shared memory. Only the drivers are decoded up front. The features, along
+    with their implementations, are decoded each time they are accessed and
+    are not kept, so that the processes reading the matrix don't each hold
+    a copy of it. Use materialize() to decode them once when they are
+    walked repeatedly.
+    """
+
+    def __init__(self, buf: memoryview) -> None:
+        magic, n_strings, n_ints, _ = _SHARED_MATRIX_HEADER.unpack_from(buf)
+        if magic != SHARED_MATRIX_MAGIC:
+            raise ValueError("Invalid shared support matrix")
+
+        pos = _SHARED_MATRIX_HEADER.size
+        size = 4 * (n_strings + 1)
+        self._offsets = buf[pos : pos + size].cast('I')
+        pos += size
+        self._ints = buf[pos : pos + 4 * n_ints].cast('i')
+        pos += 4 * n_ints
+        self._blob = buf[pos:]
+
+        ints = self._ints
+        self.drivers = {}
+        self._driver_keys = []
+        for idx in range(ints[0]):
+            key, title, link = ints[1 + 3 * idx : 4 + 3 * idx]
+            self.drivers[self._string(key)] = Driver(
+                self._string(title), self._optional_string(link)
+            )
+            self._driver_keys.append(self._string(key))
+
+        self._index = 2 + 3 * ints[0]
+        self.features = _SharedFeatures(self, ints[self._index - 1])
+
+    def materialize(self) -> Matrix:
+        matrix = Matrix.__new__(Matrix)
+        matrix.drivers = dict(self.drivers)
+        matrix.features = list(self.features)
+        return matrix
+
+    def _string(self, idx: int) -> str:
+        return str(
+            self._blob[self._offsets[idx] : self._offsets[idx + 1]], 'utf-8'
+        )
+
+    def _optional_string(self, idx: int) -> str | None:
+        return None if idx < 0 else self._string(idx)
+
+    def _feature(self, idx: int) -> 'Feature':
+        ints = self._ints
+        pos = ints[self._index + idx]
+        key, title, status, group, notes, cli, api, n_impls = ints[
+            pos : pos + _SHARED_FEATURE_SIZE
+        ]
+        feature = Feature(
+            self._string(key),
+            self._string(title),
+            status=Feature.STATUS_ALL[status],
+            group=self._optional_string(group),
+            notes=self._optional_string(notes),
+            cli=self._optional_string(cli),
+            api=self._optional_string(api),
+        )
+
+        pos += _SHARED_FEATURE_SIZE
+        for _ in range(n_impls):
+            driver, status, notes = ints[
+                pos : pos + _SHARED_IMPLEMENTATION_SIZE
+            ]
+            feature.implementations[self._driver_keys[driver]] = (
+                Implementation(
+                    status=Implementation.STATUS_ALL[status],
+                    notes=self._optional_string(notes),
+                )
+            )
+            pos += _SHARED_IMPLEMENTATION_SIZE
+        return feature
+
+
+class _SharedFeatures(Sequence['Feature']):
+    """The features of a SharedMatrix, decoded on access."""
+
+    def __init__(self, matrix: SharedMatrix, length: int) -> None:
+        self._matrix = matrix
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, idx: int) -> 'Feature': ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> 'list[Feature]': ...
+
+    def __getitem__(self, idx: int | slice) -> 'Feature | list[Feature]':
+        if isinstance(idx, slice):
+            return [
+                self._matrix._feature(i)
+                for i in range(*idx.indices(len(self)))
+            ]
+        if idx < 0:
+            idx += self._length
+        if not 0 <= idx < self._length:
+            raise IndexError(idx)
+        return self._matrix._feature(idx)
+
+
+def share_support_matrix(fpath: str) -> None:
+    """Place a support matrix in shared memory.
+
+    Processes forked afterwards, such as the parallel readers of Sphinx,
+    decode the matrix from the shared memory when they need it instead of
+    parsing the INI file and holding their own copy of it. The matrix is
+    parsed without being cached, so that only the encoded copy is kept.
+
+    :param fpath: Path to the INI file
+    """
+    fpath = path.abspath(fpath)
+    st = os.stat(fpath)
+    cfg = configparser.ConfigParser()
+    with open(fpath) as fp:
+        cfg.read_file(fp)
+    data = _encode_matrix(Matrix(cfg))
+
+    shm = shared_memory.SharedMemory(create=True, size=len(data))
+    cast(memoryview, shm.buf)[: len(data)] = data
+
+    unshare_support_matrices([fpath])
+    _SHARED_MATRICES[fpath] = (os.getpid(), (st.st_mtime_ns, st.st_size), shm)
+
+
+def unshare_support_matrices(fpaths: Iterable[str] | None = None) -> None:
+    """Release the shared memory of support matrices.
+
+    :param fpaths: Paths to the INI files, all of them if None
+    """
+    if fpaths is None:
+        fpaths = list(_SHARED_MATRICES)
+
+    for fpath in fpaths:
+        shared = _SHARED_MATRICES.pop(path.abspath(fpath), None)
+        if shared is None:
+            continue
+        shared[2].close()
+        if shared[0] == os.getpid():
+            shared[2].unlink()
 
 
 class Feature:
@@ -246,14 +994,521 @@ class Driver:
         self.link = link
 
 
+class Snapshot:
+    def __init__(
+        self,
+        release: str,
+        drivers: dict[str, str],
+        features: dict[str, tuple[str, str]],
+        cells: dict[str, dict[str, str]],
+    ) -> None:
+        """A compact copy of a support matrix as of a given release.
+
+        :param release: The release the snapshot was taken for
+        :param drivers: Maps driver keys to their titles
+        :param features: Maps feature keys to their (title, status)
+        :param cells: Maps feature keys to a mapping of driver keys to
+            implementation statuses
+        """
+        self.release = release
+        self.drivers = drivers
+        self.features = features
+        self.cells = cells
+
+    @classmethod
+    def from_matrix(cls, release: str, matrix: Matrix) -> 'Snapshot':
+        drivers = {key: driver.title for key, driver in matrix.drivers.items()}
+        features = {}
+        cells = {}
+        for feature in matrix.features:
+            features[feature.key] = (feature.title, feature.status)
+            cells[feature.key] = {
+                key: impl.status
+                for key, impl in feature.implementations.items()
+            }
+        return cls(release, drivers, features, cells)
+
+    def coverage(self, driver: str) -> float | None:
+        """Return the share of features implemented by a driver.
+
+        Complete implementations count fully and partial implementations
+        count half. Returns None if the driver is not part of the snapshot.
+        """
+        if driver not in self.drivers:
+            return None
+        return _coverage(
+            (
+                cells[driver]
+                for cells in self.cells.values()
+                if driver in cells
+            ),
+            len(self.features),
+        )
+
+
+class SnapshotStore:
+    """Append-only history of support matrix snapshots.
+
+    The store is a JSON lines file with one entry per recorded snapshot.
+    Each entry only holds the drivers, features and cells which changed
+    since the previous entry, removed items being recorded as null. As the
+    file is only ever appended to, reloading it only requires reading the
+    entries written since it was last read.
+    """
+
+    def __init__(self, fpath: str) -> None:
+        self.fpath = fpath
+        self.snapshots: dict[str, Snapshot] = {}
+        self._latest: Snapshot | None = None
+        self._offset = 0
+        self._lock = threading.Lock()
+
+    @property
+    def releases(self) -> list[str]:
+        """The recorded releases, oldest first."""
+        with self._lock:
+            self._refresh()
+            return list(self.snapshots)
+
+    def get(self, release: str) -> Snapshot | None:
+        with self._lock:
+            self._refresh()
+            return self.snapshots.get(release)
+
+    def append(self, release: str, matrix: Matrix) -> bool:
+        """Record the state of a matrix for a release.
+
+        :returns: False if the release was already recorded with the same
+            content and nothing was written, True otherwise.
+        """
+        snapshot = Snapshot.from_matrix(release, matrix)
+
+        with self._lock:
+            self._refresh()
+            recorded = self.snapshots.get(release)
+            if recorded and len(self._diff(recorded, snapshot)) == 1:
+                return False
+
+            entry = self._diff(self._latest, snapshot)
+            line = json.dumps(entry, separators=(',', ':')) + '\n'
+            with open(self.fpath, 'a') as fp:
+                fp.write(line)
+            # Read back our entry, along with any entry written by another
+            # process in the meantime
+            self._refresh()
+            return True
+
+    def trend(self, driver: str) -> list[tuple[str, float | None]]:
+        """Return the coverage of a driver for each recorded release."""
+        with self._lock:
+            self._refresh()
+            return [
+                (release, snapshot.coverage(driver))
+                for release, snapshot in self.snapshots.items()
+            ]
+
+    def _refresh(self) -> None:
+        try:
+            size = os.path.getsize(self.fpath)
+        except FileNotFoundError:
+            size = 0
+
+        if size < self._offset:
+            # The file was replaced rather than appended to
+            self.snapshots = {}
+            self._latest = None
+            self._offset = 0
+
+        if size == self._offset:
+            return
+
+        with open(self.fpath, 'rb') as fp:
+            fp.seek(self._offset)
+            for line in fp:
+                if not line.endswith(b'\n'):
+                    # A partially written entry; pick it up next time
+                    break
+                self._offset += len(line)
+                if line.strip():
+                    self._apply(json.loads(line))
+
+    def _apply(self, entry: dict[str, Any]) -> None:
+        latest = self._latest
+        drivers = dict(latest.drivers) if latest else {}
+        features = dict(latest.features) if latest else {}
+        cells = dict(latest.cells) if latest else {}
+
+        for key, title in entry.get('drivers', {}).items():
+            if title is None:
+                drivers.pop(key, None)
+            else:
+                drivers[key] = title
+
+        for key, value in entry.get('features', {}).items():
+            if value is None:
+                features.pop(key, None)
+                cells.pop(key, None)
+            else:
+                features[key] = (value[0], value[1])
+
+        for key, changes in entry.get('cells', {}).items():
+            row = dict(cells.get(key, {}))
+            for driver, status in changes.items():
+                if status is None:
+                    row.pop(driver, None)
+                else:
+                    row[driver] = status
+            cells[key] = row
+
+        release = entry['release']
+        snapshot = Snapshot(release, drivers, features, cells)
+        # A release recorded again keeps its original position
+        self.snapshots[release] = snapshot
+        self._latest = snapshot
+
+    @staticmethod
+    def _diff(old: Snapshot | None, new: Snapshot) -> dict[str, Any]:
+        old_drivers = old.drivers if old else {}
+        old_features = old.features if old else {}
+        old_cells = old.cells if old else {}
+
+        entry: dict[str, Any] = {'release': new.release}
+
+        drivers: dict[str, str | None] = {
+            key: title
+            for key, title in new.drivers.items()
+            if old_drivers.get(key) != title
+        }
+        drivers.update(
+            {key: None for key in old_drivers.keys() - new.drivers.keys()}
+        )
+        if drivers:
+            entry['drivers'] = drivers
+
+        features: dict[str, tuple[str, str] | None] = {
+            key: value
+            for key, value in new.features.items()
+            if old_features.get(key) != value
+        }
+        features.update(
+            {key: None for key in old_features.keys() - new.features.keys()}
+        )
+        if features:
+            entry['features'] = features
+
+        cells: dict[str, dict[str, str | None]] = {}
+        for key, row in new.cells.items():
+            old_row = old_cells.get(key, {})
+            if row == old_row:
+                continue
+            changes: dict[str, str | None] = {
+                driver: status
+                for driver, status in row.items()
+                if old_row.get(driver) != status
+            }
+            changes.update(
+                {driver: None for driver in old_row.keys() - row.keys()}
+            )
+            cells[key] = changes
+        if cells:
+            entry['cells'] = cells
+
+        return entry
+
+
+_SNAPSHOT_STORES: dict[str, SnapshotStore] = {}
+_SNAPSHOT_STORES_LOCK = threading.Lock()
+
+
+def get_snapshot_store(fpath: str) -> SnapshotStore:
+    """Return the snapshot store for a file, creating it if needed.
+
+    Stores are kept for the lifetime of the process so that each history
+    file is only read once.
+    """
+    fpath = path.abspath(fpath)
+    with _SNAPSHOT_STORES_LOCK:
+        if fpath not in _SNAPSHOT_STORES:
+            _SNAPSHOT_STORES[fpath] = SnapshotStore(fpath)
+        return _SNAPSHOT_STORES[fpath]
+
+
+class MatrixChange:
+    DRIVER_ADDED = "driver-added"
+    DRIVER_REMOVED = "driver-removed"
+    FEATURE_ADDED = "feature-added"
+    FEATURE_REMOVED = "feature-removed"
+    FEATURE_STATUS = "feature-status"
+    FEATURE_NOTES = "feature-notes"
+    IMPLEMENTATION_STATUS = "implementation-status"
+    IMPLEMENTATION_NOTES = "implementation-notes"
+
+    ALL = [
+        DRIVER_ADDED,
+        DRIVER_REMOVED,
+        FEATURE_ADDED,
+        FEATURE_REMOVED,
+        FEATURE_STATUS,
+        FEATURE_NOTES,
+        IMPLEMENTATION_STATUS,
+        IMPLEMENTATION_NOTES,
+    ]
+
+    def __init__(
+        self,
+        kind: str,
+        feature: str | None = None,
+        driver: str | None = None,
+        old: str | None = None,
+        new: str | None = None,
+    ) -> None:
+        """A single difference between two support matrices.
+
+        :param kind: One of the kinds of change defined on this class
+        :param feature: The key of the feature which changed, if any
+        :param driver: The key of the driver which changed, if any
+        :param old: The previous value, if any
+        :param new: The new value, if any
+        """
+        self.kind = kind
+        self.feature = feature
+        self.driver = driver
+        self.old = old
+        self.new = new
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MatrixChange):
+            return NotImplemented
+        return vars(self) == vars(other)
+
+    def __repr__(self) -> str:
+        return "MatrixChange({})".format(
+            ", ".join(f"{k}={v!r}" for k, v in vars(self).items())
+        )
+
+
+def _feature_notes(matrix: Matrix | Snapshot) -> dict[str, str | None] | None:
+    if isinstance(matrix, Snapshot):
+        # snapshots don't record notes
+        return None
+    return {feature.key: feature.notes for feature in matrix.features}
+
+
+def _implementation_notes(
+    matrix: Matrix | Snapshot,
+) -> dict[tuple[str, str], str | None] | None:
+    if isinstance(matrix, Snapshot):
+        # snapshots don't record notes
+        return None
+    return {
+        (feature.key, key): impl.notes
+        for feature in matrix.features
+        for key, impl in feature.implementations.items()
+    }
+
+
+def diff_matrices(
+    old: Matrix | Snapshot, new: Matrix | Snapshot
+) -> list[MatrixChange]:
+    """Compute the differences between two support matrices.
+
+    Either side can be a parsed Matrix or a Snapshot from a history file.
+    Changes to the implementation of a feature by a driver are only
+    reported if both exist on each side, and changes to the feature and
+    implementation notes are only reported if neither side is a Snapshot.
+
+    :returns: The drivers added and removed, then the features added,
+        removed and whose status or notes changed, then the implementation
+        changes.
+    """
+    old_feature_notes = _feature_notes(old)
+    new_feature_notes = _feature_notes(new)
+    old_notes = _implementation_notes(old)
+    new_notes = _implementation_notes(new)
+    if not isinstance(old, Snapshot):
+        old = Snapshot.from_matrix('', old)
+    if not isinstance(new, Snapshot):
+        new = Snapshot.from_matrix('', new)
+
+    changes = []
+
+    for key in new.drivers.keys() - old.drivers.keys():
+        changes.append(MatrixChange(MatrixChange.DRIVER_ADDED, driver=key))
+    for key in old.drivers.keys() - new.drivers.keys():
+        changes.append(MatrixChange(MatrixChange.DRIVER_REMOVED, driver=key))
+
+    for key in new.features.keys() - old.features.keys():
+        changes.append(MatrixChange(MatrixChange.FEATURE_ADDED, feature=key))
+    for key in old.features.keys() - new.features.keys():
+        changes.append(MatrixChange(MatrixChange.FEATURE_REMOVED, feature=key))
+    for key, (_, status) in new.features.items() - old.features.items():
+        if key in old.features and old.features[key][1] != status:
+            changes.append(
+                MatrixChange(
+                    MatrixChange.FEATURE_STATUS,
+                    feature=key,
+                    old=old.features[key][1],
+                    new=status,
+                )
+            )
+
+    # Only cells whose feature and driver exist on both sides matter; the
+    # others are covered by the changes above.
+    drivers = old.drivers.keys() & new.drivers.keys()
+    features = old.features.keys() & new.features.keys()
+
+    if old_feature_notes is not None and new_feature_notes is not None:
+        for key in features:
+            if old_feature_notes[key] != new_feature_notes[key]:
+                changes.append(
+                    MatrixChange(
+                        MatrixChange.FEATURE_NOTES,
+                        feature=key,
+                        old=old_feature_notes[key],
+                        new=new_feature_notes[key],
+                    )
+                )
+
+    def _cells(snapshot: Snapshot) -> dict[tuple[str, str], str]:
+        return {
+            (feature, driver): status
+            for feature in features
+            for driver, status in snapshot.cells.get(feature, {}).items()
+            if driver in drivers
+        }
+
+    old_cells = _cells(old)
+    new_cells = _cells(new)
+    for cell in {cell for cell, _ in new_cells.items() ^ old_cells.items()}:
+        changes.append(
+            MatrixChange(
+                MatrixChange.IMPLEMENTATION_STATUS,
+                feature=cell[0],
+                driver=cell[1],
+                old=old_cells.get(cell),
+                new=new_cells.get(cell),
+            )
+        )
+
+    if old_notes is not None and new_notes is not None:
+        for cell in old_cells.keys() & new_cells.keys():
+            if old_notes.get(cell) != new_notes.get(cell):
+                changes.append(
+                    MatrixChange(
+                        MatrixChange.IMPLEMENTATION_NOTES,
+                        feature=cell[0],
+                        driver=cell[1],
+                        old=old_notes.get(cell),
+                        new=new_notes.get(cell),
+                    )
+                )
+
+    # Set operations don't preserve any order; follow the order of the
+    # kinds of change, then of the features and drivers in the files.
+    kinds = {kind: idx for idx, kind in enumerate(MatrixChange.ALL)}
+    order = {
+        key: idx for idx, key in enumerate([*old.features, *new.features])
+    }
+    order.update(
+        (key, idx) for idx, key in enumerate([*old.drivers, *new.drivers])
+    )
+    changes.sort(
+        key=lambda c: (
+            kinds[c.kind],
+            order.get(c.feature or '', -1),
+            order.get(c.driver or '', -1),
+        )
+    )
+    return changes
+
+
 class Directive(rst.Directive):
     # support-matrix.ini is the arg
     required_arguments = 1
+    option_spec = {
+        'history': rst.directives.unchanged,
+        'layout': lambda arg: rst.directives.choice(arg, SUMMARY_LAYOUTS),
+        'chunk-size': rst.directives.positive_int,
+        'namespace': rst.directives.unchanged_required,
+    }
 
     def run(self) -> list[nodes.Element]:
         matrix = self._load_support_matrix()
+        env = self.state.document.settings.env
+        namespace = self.options.get('namespace')
+        source = env.relfn2path(self.arguments[0])[0]
+        self._register_objects(
+            matrix,
+            source,
+            f"{namespace}." if namespace else '',
+            anchor_prefix='',
+        )
+        self._note_driver_summaries(matrix, source)
         return self._build_markup(matrix)
 
+    def _register_objects(
+        self,
+        matrix: Matrix,
+        source: str,
+        prefix: str = '',
+        anchor_prefix: str | None = None,
+    ) -> None:
+        """Register the features and drivers with the ``sm`` domain.
+
+        This allows them to be referenced with the ``sm:feature`` and
+        ``sm:driver`` roles, including from other projects through their
+        object inventory.
+
+        :param source: The path of the INI file, relative to the source
+            directory
+        :param prefix: Prepended to the name of the objects
+        :param anchor_prefix: Prepended to the anchors of the objects,
+            matching the prefix used to build the markup. Defaults to the
+            prefix of the names.
+        """
+        env = self.state.document.settings.env
+        domain = env.get_domain('sm')
+        location = (env.docname, self.lineno)
+        if anchor_prefix is None:
+            anchor_prefix = prefix
+        for key, driver in matrix.drivers.items():
+            domain.note_object(
+                'driver',
+                prefix + key,
+                driver.title,
+                re.sub(KEY_PATTERN, "_", anchor_prefix + key),
+                source,
+                location,
+            )
+        for feature in matrix.features:
+            domain.note_object(
+                'feature',
+                prefix + feature.key,
+                feature.title,
+                re.sub(KEY_PATTERN, "_", anchor_prefix + feature.key),
+                source,
+                location,
+            )
+
+    def _note_driver_summaries(self, matrix: Matrix, source: str) -> None:
+        """Keep a summary of each driver for the badges.
+
+        The summaries are written out along with a coverage badge for each
+        driver once the build is finished.
+
+        :param source: The path of the INI file, relative to the source
+            directory. Badges are grouped by INI file, as different
+            matrices may share driver keys.
+        """
+        env = self.state.document.settings.env
+        domain = env.get_domain('sm')
+        directory = re.sub(KEY_PATTERN, "_", path.splitext(source)[0])
+        for key in matrix.drivers:
+            domain.note_driver_summary(
+                f"{directory}/{re.sub(KEY_PATTERN, '_', key)}",
+                driver_summary(matrix, key),
+            )
+
     def _load_support_matrix(self) -> Matrix:
         """Parse support-matrix.ini file.
 
@@ -263,42 +1518,113 @@ class Directive(rst.Directive):
         :returns: Matrix instance
         """
 
-        cfg = configparser.ConfigParser()
         env = self.state.document.settings.env
         fname = self.arguments[0]
         rel_fpath, fpath = env.relfn2path(fname)
 
-        with open(fpath) as fp:
-            cfg.read_file(fp)
+        # the features are walked many times while building the markup
+        matrix = load_support_matrix(fpath).materialize()
 
         # This ensures that the docs are rebuilt whenever the
         # .ini file changes
         env.note_dependency(rel_fpath)
 
-        matrix = Matrix(cfg)
         return matrix
 
     def _build_markup(self, matrix: Matrix) -> list[nodes.Element]:
         """Constructs the docutils content for the support matrix."""
         content: list[nodes.Element] = []
-        self._build_summary(matrix, content)
+        transposed, chunk_size = self._choose_layout(matrix)
+        self._build_summary(
+            matrix, content, transposed=transposed, chunk_size=chunk_size
+        )
         self._build_details(matrix, content)
         self._build_notes(content)
         return content
 
-    @staticmethod
-    def _build_summary(matrix: Matrix, content: list[nodes.Element]) -> None:
+    def _choose_layout(self, matrix: Matrix) -> tuple[bool, int | None]:
+        """Pick the orientation and chunking of the summary table.
+
+        In ``auto`` mode, the larger of the drivers and features are laid
+        out as rows and the columns are split in blocks if there are too
+        many of them.
+
+        :returns: Whether drivers should be laid out as rows and the
+            maximum number of columns per table, if any
+        """
+        layout = self.options.get('layout')
+        chunk_size = self.options.get('chunk-size', SUMMARY_CHUNK_SIZE)
+
+        if layout == 'transposed':
+            return True, None
+        if layout == 'chunked':
+            return False, chunk_size
+        if layout == 'auto':
+            transposed = len(matrix.drivers) > len(matrix.features)
+            cols = len(matrix.features) if transposed else len(matrix.drivers)
+            return transposed, chunk_size if cols > chunk_size else None
+        return False, None
+
+    @classmethod
+    def _build_summary(
+        cls,
+        matrix: Matrix,
+        content: list[nodes.Element],
+        prefix: str = '',
+        transposed: bool = False,
+        chunk_size: int | None = None,
+    ) -> None:
         """Constructs the content for the summary of the support matrix.
 
         The summary consists of a giant table, with one row
         for each feature, and a column for each backend
         driver. It provides an 'at a glance' summary of the
         status of each driver.
+
+        If transposed, the table has one row for each driver and a column
+        for each feature instead. If a chunk size is given, the columns are
+        split across several tables of at most that many columns.
+
+        The prefix is prepended to the anchors linking to the details, so
+        that several matrices can be rendered in the same document.
         """
 
         summary_title = nodes.subtitle(text="Summary")
+        content.append(summary_title)
+
+        impls = sorted(matrix.drivers, key=lambda x: matrix.drivers[x].title)
+        cols = len(matrix.features) if transposed else len(impls)
+        if chunk_size is None:
+            chunk_size = max(cols, 1)
+
+        for idx in range(0, max(cols, 1), chunk_size):
+            if transposed:
+                features = matrix.features[idx : idx + chunk_size]
+                # the driver rows are repeated in every table, only the
+                # first one holds their anchors
+                summary = cls._build_summary_transposed(
+                    matrix, features, impls, prefix, anchors=idx == 0
+                )
+            else:
+                summary = cls._build_summary_table(
+                    matrix,
+                    matrix.features,
+                    impls[idx : idx + chunk_size],
+                    prefix,
+                )
+            content.append(summary)
+
+    @classmethod
+    def _build_summary_table(
+        cls,
+        matrix: Matrix,
+        features: Sequence[Feature],
+        impls: list[str],
+        prefix: str,
+    ) -> nodes.table:
+        """Constructs a summary table with one row for each feature."""
         summary = nodes.table(classes=["sp_feature_cells"])
-        cols = len(matrix.drivers.keys())
+        cols = len(impls)
 
         # Add two columns for the Feature and Status columns.
         cols += 2
@@ -312,8 +1638,6 @@ class Directive(rst.Directive):
         summary_group.append(summary_head)
         summary_group.append(summary_body)
         summary.append(summary_group)
-        content.append(summary_title)
-        content.append(summary)
 
         # This sets up all the column headers - two fixed
         # columns for feature name & status
@@ -327,73 +1651,154 @@ class Directive(rst.Directive):
         summary_head.append(header)
 
         # then one column for each backend driver
-        impls = sorted(matrix.drivers, key=lambda x: matrix.drivers[x].title)
         for key in impls:
-            driver = matrix.drivers[key]
-            implcol = nodes.entry(classes=["sp_feature_cells"])
-            header.append(implcol)
-            if driver.link:
-                uri = driver.link
-                target_ref = nodes.reference("", refuri=uri)
-                target_txt = nodes.inline()
-                implcol.append(target_txt)
-                target_txt.append(target_ref)
-                target_ref.append(nodes.strong(text=driver.title))
-            else:
-                implcol.append(nodes.strong(text=driver.title))
+            driver_id = re.sub(KEY_PATTERN, "_", prefix + key)
+            header.append(
+                cls._build_driver_entry(matrix.drivers[key], driver_id)
+            )
 
         # We now produce the body of the table, one row for
         # each feature to report on
-        for feature in matrix.features:
+        for feature in features:
             item = nodes.row()
 
-            # the hyperlink driver name linking to details
-            feature_id = re.sub(KEY_PATTERN, "_", feature.key)
-
             # first the fixed columns for title/status
-            key_col = nodes.entry(classes=["sp_feature_cells"])
-            item.append(key_col)
-            key_ref = nodes.reference(refid=feature_id)
-            key_txt = nodes.inline()
-            key_col.append(key_txt)
-            key_txt.append(key_ref)
-            key_ref.append(nodes.strong(text=feature.title))
-
-            status_col = nodes.entry(classes=["sp_feature_cells"])
-            item.append(status_col)
-            status_col.append(
-                nodes.inline(
-                    text=feature.status,
-                    classes=["sp_feature_" + feature.status],
-                )
-            )
+            item.append(cls._build_feature_entry(feature, prefix))
+            item.append(cls._build_status_entry(feature))
 
             # and then one column for each backend driver
             for key in impls:
-                impl = feature.implementations[key]
-                impl_col = nodes.entry(classes=["sp_feature_cells"])
-                item.append(impl_col)
+                item.append(cls._build_impl_entry(feature, key, prefix))
 
-                key_id = re.sub(KEY_PATTERN, "_", f"{feature.key}_{key}")
+            summary_body.append(item)
 
-                impl_ref = nodes.reference(refid=key_id)
-                impl_txt = nodes.inline()
-                impl_col.append(impl_txt)
-                impl_txt.append(impl_ref)
+        return summary
+
+    @classmethod
+    def _build_summary_transposed(
+        cls,
+        matrix: Matrix,
+        features: Sequence[Feature],
+        impls: list[str],
+        prefix: str,
+        anchors: bool = True,
+    ) -> nodes.table:
+        """Constructs a summary table with one row for each driver."""
+        summary = nodes.table(classes=["sp_feature_cells"])
 
-                status = STATUS_SYMBOLS.get(impl.status, "")
+        # Add one column for the Driver column.
+        cols = len(features) + 1
 
-                impl_ref.append(
-                    nodes.literal(
-                        text=status,
-                        classes=["sp_impl_summary", "sp_impl_" + impl.status],
-                    )
-                )
+        summary_group = nodes.tgroup(cols=cols)
+        summary_body = nodes.tbody()
+        summary_head = nodes.thead()
 
+        for i in range(cols):
+            summary_group.append(nodes.colspec(colwidth=1))
+        summary_group.append(summary_head)
+        summary_group.append(summary_body)
+        summary.append(summary_group)
+
+        # Two header rows, one for the feature names and one for their
+        # status
+        header = nodes.row()
+        blank = nodes.entry(classes=["sp_feature_cells"])
+        blank.append(nodes.emphasis(text="Feature"))
+        header.append(blank)
+        status_header = nodes.row()
+        blank = nodes.entry(classes=["sp_feature_cells"])
+        blank.append(nodes.emphasis(text="Status"))
+        status_header.append(blank)
+        summary_head.append(header)
+        summary_head.append(status_header)
+
+        for feature in features:
+            header.append(cls._build_feature_entry(feature, prefix))
+            status_header.append(cls._build_status_entry(feature))
+
+        # then one row for each backend driver
+        for key in impls:
+            item = nodes.row()
+            driver_id = None
+            if anchors:
+                driver_id = re.sub(KEY_PATTERN, "_", prefix + key)
+            item.append(
+                cls._build_driver_entry(matrix.drivers[key], driver_id)
+            )
+            for feature in features:
+                item.append(cls._build_impl_entry(feature, key, prefix))
             summary_body.append(item)
 
+        return summary
+
+    @staticmethod
+    def _build_driver_entry(
+        driver: Driver, driver_id: str | None = None
+    ) -> nodes.entry:
+        implcol = nodes.entry(classes=["sp_feature_cells"])
+        if driver_id is not None:
+            implcol['ids'].append(driver_id)
+        if driver.link:
+            uri = driver.link
+            target_ref = nodes.reference("", refuri=uri)
+            target_txt = nodes.inline()
+            implcol.append(target_txt)
+            target_txt.append(target_ref)
+            target_ref.append(nodes.strong(text=driver.title))
+        else:
+            implcol.append(nodes.strong(text=driver.title))
+        return implcol
+
+    @staticmethod
+    def _build_feature_entry(feature: Feature, prefix: str) -> nodes.entry:
+        # the hyperlink feature name linking to details
+        feature_id = re.sub(KEY_PATTERN, "_", prefix + feature.key)
+
+        key_col = nodes.entry(classes=["sp_feature_cells"])
+        key_ref = nodes.reference(refid=feature_id)
+        key_txt = nodes.inline()
+        key_col.append(key_txt)
+        key_txt.append(key_ref)
+        key_ref.append(nodes.strong(text=feature.title))
+        return key_col
+
+    @staticmethod
+    def _build_status_entry(feature: Feature) -> nodes.entry:
+        status_col = nodes.entry(classes=["sp_feature_cells"])
+        status_col.append(
+            nodes.inline(
+                text=feature.status,
+                classes=["sp_feature_" + feature.status],
+            )
+        )
+        return status_col
+
+    @staticmethod
+    def _build_impl_entry(
+        feature: Feature, key: str, prefix: str
+    ) -> nodes.entry:
+        impl = feature.implementations[key]
+        impl_col = nodes.entry(classes=["sp_feature_cells"])
+
+        key_id = re.sub(KEY_PATTERN, "_", f"{prefix}{feature.key}_{key}")
+
+        impl_ref = nodes.reference(refid=key_id)
+        impl_txt = nodes.inline()
+        impl_col.append(impl_txt)
+        impl_txt.append(impl_ref)
+
+        status = STATUS_SYMBOLS.get(impl.status, "")
+
+        impl_ref.append(
+            nodes.literal(
+                text=status,
+                classes=["sp_impl_summary", "sp_impl_" + impl.status],
+            )
+        )
+        return impl_col
+
     def _build_details(
-        self, matrix: Matrix, content: list[nodes.Element]
+        self, matrix: Matrix, content: list[nodes.Element], prefix: str = ''
     ) -> None:
         """Constructs the content for the details of the support matrix."""
 
@@ -411,7 +1816,7 @@ class Directive(rst.Directive):
             if feature.group is not None:
                 status += f"({feature.group})"
 
-            feature_id = re.sub(KEY_PATTERN, "_", feature.key)
+            feature_id = re.sub(KEY_PATTERN, "_", prefix + feature.key)
 
             # Highlight the feature title name
             item.append(nodes.strong(text=feature.title, ids=[feature_id]))
@@ -444,7 +1849,9 @@ class Directive(rst.Directive):
                 impl = feature.implementations[key]
                 subitem = nodes.list_item()
 
-                key_id = re.sub(KEY_PATTERN, "_", f"{feature.key}_{key}")
+                key_id = re.sub(
+                    KEY_PATTERN, "_", f"{prefix}{feature.key}_{key}"
+                )
 
                 subitem += [
                     nodes.strong(text=f"{driver.title}: "),
@@ -528,21 +1935,1159 @@ class Directive(rst.Directive):
         return para
 
 
+def _aggregate_entry(line: str, registry: dict[str, str]) -> tuple[str, str]:
+    """Resolve a line of the support_matrix_aggregate directive.
+
+    A line is either the name of a registered matrix, a path to an INI file
+    or a ``name = path`` pair. Unless given, the name of a matrix is its
+    path without the extension, as most projects name their file
+    support-matrix.ini.
+
+    :returns: The name of the matrix and the path to its INI file, as
+        given to relfn2path
+    """
+    if line in registry:
+        # registered paths are relative to the source directory
+        return line, '/' + registry[line]
+    if '=' in line:
+        name, fname = line.split('=', 1)
+        return name.strip(), fname.strip()
+    return path.splitext(line)[0].lstrip('/'), line
+
+
+class AggregateDirective(Directive):
+    """Render several support matrices in a single document.
+
+    Each line of the content is either the name of a matrix registered in
+    the ``support_matrix_registry`` configuration option or a path to a
+    support-matrix.ini file, relative to the document.
+    """
+
+    required_arguments = 0
+    has_content = True
+    option_spec = {
+        'dedupe': lambda arg: rst.directives.choice(arg, ('key', 'title')),
+        'max-workers': rst.directives.positive_int,
+        'layout': lambda arg: rst.directives.choice(arg, SUMMARY_LAYOUTS),
+        'chunk-size': rst.directives.positive_int,
+    }
+
+    def run(self) -> list[nodes.Element]:
+        env = self.state.document.settings.env
+        registry = env.config.support_matrix_registry
+
+        names = []
+        rel_fpaths = []
+        fpaths = []
+        anchors = set()
+        for line in self.content:
+            line = line.strip()
+            if not line:
+                continue
+
+            name, fname = _aggregate_entry(line, registry)
+            # the name is used for the anchors and the object names
+            anchor = re.sub(KEY_PATTERN, "_", name)
+            if anchor in anchors:
+                raise self.error(
+                    f"Duplicate support matrix name '{name}'. Use "
+                    f"'<name> = {fname}' to name the matrix."
+                )
+            anchors.add(anchor)
+            rel_fpath, fpath = env.relfn2path(fname)
+
+            names.append(name)
+            rel_fpaths.append(rel_fpath)
+            fpaths.append(fpath)
+
+        matrices = [
+            matrix.materialize()
+            for matrix in load_support_matrices(
+                fpaths, max_workers=self.options.get('max-workers')
+            )
+        ]
+
+        for rel_fpath in rel_fpaths:
+            env.note_dependency(rel_fpath)
+
+        content: list[nodes.Element] = []
+        self._build_overview(
+            names, matrices, content, self.options.get('dedupe', 'key')
+        )
+        for name, rel_fpath, matrix in zip(names, rel_fpaths, matrices):
+            self._register_objects(matrix, rel_fpath, f"{name}.")
+            self._note_driver_summaries(matrix, rel_fpath)
+            prefix = f"{name}_"
+            content.append(
+                nodes.subtitle(text=name, ids=[re.sub(KEY_PATTERN, "_", name)])
+            )
+            transposed, chunk_size = self._choose_layout(matrix)
+            self._build_summary(
+                matrix,
+                content,
+                prefix,
+                transposed=transposed,
+                chunk_size=chunk_size,
+            )
+            self._build_details(matrix, content, prefix)
+        self._build_notes(content)
+        return content
+
+    @staticmethod
+    def _build_overview(
+        names: list[str],
+        matrices: list[Matrix],
+        content: list[nodes.Element],
+        dedupe: str,
+    ) -> None:
+        """Constructs the overview of the drivers across all matrices.
+
+        The overview is a table with one row for each driver, once
+        de-duplicated by key or title, and a column for each matrix giving
+        the coverage of the driver in it.
+        """
+        # maps the de-duplication key to the driver title and its key in
+        # each matrix
+        drivers: dict[str, tuple[str, dict[int, str]]] = {}
+        for idx, matrix in enumerate(matrices):
+            for key, driver in matrix.drivers.items():
+                dedupe_key = key if dedupe == 'key' else driver.title
+                title, keys = drivers.setdefault(
+                    dedupe_key, (driver.title, {})
+                )
+                keys[idx] = key
+
+        overview = nodes.table(classes=["sp_feature_cells"])
+        cols = len(matrices) + 1
+        group = nodes.tgroup(cols=cols)
+        head = nodes.thead()
+        body = nodes.tbody()
+        for i in range(cols):
+            group.append(nodes.colspec(colwidth=1))
+        group.append(head)
+        group.append(body)
+        overview.append(group)
+        content.append(nodes.subtitle(text="Overview"))
+        content.append(overview)
+
+        header = nodes.row()
+        entry = nodes.entry(classes=["sp_feature_cells"])
+        entry.append(nodes.emphasis(text="Driver"))
+        header.append(entry)
+        # each matrix name links to the matrix further down the document
+        for name in names:
+            entry = nodes.entry(classes=["sp_feature_cells"])
+            ref = nodes.reference(refid=re.sub(KEY_PATTERN, "_", name))
+            txt = nodes.inline()
+            entry.append(txt)
+            txt.append(ref)
+            ref.append(nodes.emphasis(text=name))
+            header.append(entry)
+        head.append(header)
+
+        for title, keys in sorted(drivers.values(), key=lambda x: x[0]):
+            row = nodes.row()
+            entry = nodes.entry(classes=["sp_feature_cells"])
+            entry.append(nodes.strong(text=title))
+            row.append(entry)
+
+            for idx, matrix in enumerate(matrices):
+                entry = nodes.entry(classes=["sp_feature_cells"])
+                row.append(entry)
+                coverage = None
+                if idx in keys:
+                    coverage = matrix.coverage(keys[idx])
+                if coverage is None:
+                    entry.append(nodes.inline(text="-"))
+                else:
+                    entry.append(nodes.inline(text=f"{coverage:.0%}"))
+
+            body.append(row)
+
+
+class TrendDirective(rst.Directive):
+    """Render the coverage of each driver across the recorded releases."""
+
+    # the history file is the arg
+    required_arguments = 1
+    option_spec = {
+        'drivers': rst.directives.unchanged,
+        'releases': rst.directives.positive_int,
+    }
+
+    def run(self) -> list[nodes.Element]:
+        env = self.state.document.settings.env
+        rel_fpath, fpath = env.relfn2path(self.arguments[0])
+        env.note_dependency(rel_fpath)
+
+        store = get_snapshot_store(fpath)
+        releases = store.releases
+        if 'releases' in self.options:
+            releases = releases[-self.options['releases'] :]
+        snapshots = [store.snapshots[release] for release in releases]
+
+        if 'drivers' in self.options:
+            drivers = [
+                key.strip()
+                for key in self.options['drivers'].split(',')
+                if key.strip()
+            ]
+        else:
+            drivers = sorted({key for s in snapshots for key in s.drivers})
+
+        return self._build_trend(drivers, snapshots)
+
+    @staticmethod
+    def _build_trend(
+        drivers: list[str], snapshots: list[Snapshot]
+    ) -> list[nodes.Element]:
+        """Constructs the trend table.
+
+        The table has one row for each driver and one column for each
+        release, plus a final column with a sparkline of the coverage.
+        """
+        table = nodes.table(classes=["sp_feature_cells"])
+        cols = len(snapshots) + 2
+        group = nodes.tgroup(cols=cols)
+        head = nodes.thead()
+        body = nodes.tbody()
+        for i in range(cols):
+            group.append(nodes.colspec(colwidth=1))
+        group.append(head)
+        group.append(body)
+        table.append(group)
+
+        header = nodes.row()
+        for title in ["Driver", *(s.release for s in snapshots), "Trend"]:
+            entry = nodes.entry(classes=["sp_feature_cells"])
+            entry.append(nodes.emphasis(text=title))
+            header.append(entry)
+        head.append(header)
+
+        for key in drivers:
+            # use the most recent title the driver was known by
+            title = key
+            for snapshot in snapshots:
+                title = snapshot.drivers.get(key, title)
+
+            row = nodes.row()
+            entry = nodes.entry(classes=["sp_feature_cells"])
+            entry.append(nodes.strong(text=title))
+            row.append(entry)
+
+            sparkline = ""
+            for snapshot in snapshots:
+                coverage = snapshot.coverage(key)
+                entry = nodes.entry(classes=["sp_feature_cells"])
+                if coverage is None:
+                    entry.append(nodes.inline(text="-"))
+                    sparkline += " "
+                else:
+                    entry.append(nodes.inline(text=f"{coverage:.0%}"))
+                    idx = round(coverage * (len(SPARKLINE_SYMBOLS) - 1))
+                    sparkline += SPARKLINE_SYMBOLS[idx]
+                row.append(entry)
+
+            entry = nodes.entry(classes=["sp_feature_cells"])
+            entry.append(nodes.literal(text=sparkline, classes=["sp_trend"]))
+            row.append(entry)
+            body.append(row)
+
+        return [table]
+
+
+class DiffDirective(rst.Directive):
+    """Render the changes between two versions of a support matrix.
+
+    The directive takes either the paths to the old and new
+    support-matrix.ini files, or the path to the new one along with the
+    ``history`` and ``release`` options to compare it with a snapshot.
+    """
+
+    required_arguments = 1
+    optional_arguments = 1
+    option_spec = {
+        'history': rst.directives.unchanged,
+        'release': rst.directives.unchanged,
+    }
+
+    def run(self) -> list[nodes.Element]:
+        env = self.state.document.settings.env
+
+        fpaths = []
+        for fname in self.arguments:
+            rel_fpath, fpath = env.relfn2path(fname)
+            env.note_dependency(rel_fpath)
+            fpaths.append(fpath)
+
+        new = load_support_matrix(fpaths[-1]).materialize()
+        old: Matrix | Snapshot | None
+        if len(fpaths) == 2:
+            old = load_support_matrix(fpaths[0]).materialize()
+        else:
+            if 'history' not in self.options or 'release' not in self.options:
+                raise self.error(
+                    "Either two support matrices or the 'history' and "
+                    "'release' options must be given."
+                )
+            rel_fpath, fpath = env.relfn2path(self.options['history'])
+            env.note_dependency(rel_fpath)
+            old = get_snapshot_store(fpath).get(self.options['release'])
+            if old is None:
+                raise self.error(
+                    "Release '{}' is not recorded in '{}'.".format(
+                        self.options['release'], self.options['history']
+                    )
+                )
+
+        return self._build_diff(old, new, diff_matrices(old, new))
+
+    @staticmethod
+    def _build_diff(
+        old: Matrix | Snapshot,
+        new: Matrix | Snapshot,
+        changes: list[MatrixChange],
+    ) -> list[nodes.Element]:
+        """Constructs the change table.
+
+        The table has one row for each change, giving the driver and the
+        feature it applies to, if any, and a description of the change.
+        """
+        if not changes:
+            return [nodes.paragraph(text="No changes.")]
+
+        drivers: dict[str, str] = {}
+        features: dict[str, str] = {}
+        for matrix in (old, new):
+            if not isinstance(matrix, Snapshot):
+                matrix = Snapshot.from_matrix('', matrix)
+            drivers.update(matrix.drivers)
+            features.update(
+                (key, title) for key, (title, _) in matrix.features.items()
+            )
+
+        table = nodes.table(classes=["sp_feature_cells"])
+        group = nodes.tgroup(cols=3)
+        head = nodes.thead()
+        body = nodes.tbody()
+        for i in range(3):
+            group.append(nodes.colspec(colwidth=1))
+        group.append(head)
+        group.append(body)
+        table.append(group)
+
+        header = nodes.row()
+        for title in ["Driver", "Feature", "Change"]:
+            entry = nodes.entry(classes=["sp_feature_cells"])
+            entry.append(nodes.emphasis(text=title))
+            header.append(entry)
+        head.append(header)
+
+        descriptions = {
+            MatrixChange.DRIVER_ADDED: "Driver added",
+            MatrixChange.DRIVER_REMOVED: "Driver removed",
+            MatrixChange.FEATURE_ADDED: "Feature added",
+            MatrixChange.FEATURE_REMOVED: "Feature removed",
+            MatrixChange.FEATURE_NOTES: "Notes updated",
+            MatrixChange.IMPLEMENTATION_NOTES: "Notes updated",
+        }
+
+        for change in changes:
+            row = nodes.row()
+
+            entry = nodes.entry(classes=["sp_feature_cells"])
+            if change.driver is not None:
+                entry.append(nodes.strong(text=drivers[change.driver]))
+            row.append(entry)
+
+            entry = nodes.entry(classes=["sp_feature_cells"])
+            if change.feature is not None:
+                entry.append(nodes.inline(text=features[change.feature]))
+            row.append(entry)
+
+            entry = nodes.entry(classes=["sp_feature_cells"])
+            if change.kind == MatrixChange.FEATURE_STATUS:
+                entry.append(
+                    nodes.inline(
+                        text=f"Status: {change.old} \u2192 {change.new}",
+                        classes=[f"sp_feature_{change.new}"],
+                    )
+                )
+            elif change.kind == MatrixChange.IMPLEMENTATION_STATUS:
+                # the implementation may be missing on one side
+                if change.new is None:
+                    entry.append(nodes.inline(text="Implementation removed"))
+                elif change.old is None:
+                    txt = nodes.inline(text="Implementation added: ")
+                    txt.append(
+                        nodes.literal(
+                            text=change.new,
+                            classes=[f"sp_impl_{change.new}"],
+                        )
+                    )
+                    entry.append(txt)
+                else:
+                    entry.append(
+                        nodes.literal(
+                            text=f"{change.old} \u2192 {change.new}",
+                            classes=[f"sp_impl_{change.new}"],
+                        )
+                    )
+            else:
+                entry.append(nodes.inline(text=descriptions[change.kind]))
+            row.append(entry)
+
+            body.append(row)
+
+        return [table]
+
+
+class SupportMatrixDomain(Domain):
+    """Domain for the features and drivers of the support matrices.
+
+    Objects are named after their section in the INI file, for example
+    ``operation.attach-volume`` or ``driver.libvirt``. Objects rendered by
+    the ``support_matrix_aggregate`` directive are additionally prefixed
+    with the name of their matrix, for example
+    ``compute.operation.attach-volume``.
+    """
+
+    name = 'sm'
+    label = 'Support Matrix'
+    object_types = {
+        'feature': ObjType('feature', 'feature'),
+        'driver': ObjType('driver', 'driver'),
+    }
+    roles = {
+        'feature': XRefRole(),
+        'driver': XRefRole(),
+    }
+    initial_data: ClassVar[dict[str, Any]] = {
+        # (objtype, name) -> docname -> (anchor, title, source)
+        'objects': {},
+        # badge name -> docname -> summary
+        'summaries': {},
+    }
+    data_version = 1
+
+    @property
+    def objects(
+        self,
+    ) -> dict[tuple[str, str], dict[str, tuple[str, str, str]]]:
+        return self.data.setdefault('objects', {})  # type: ignore[no-any-return]
+
+    def note_object(
+        self,
+        objtype: str,
+        name: str,
+        title: str,
+        anchor: str,
+        source: str,
+        location: Any = None,
+    ) -> None:
+        """Register a feature or driver.
+
+        The same matrix may be rendered by several documents, in which case
+        references resolve to the first of them by name, and the object
+        stays registered as long as one of them renders it. Otherwise, the
+        object must be namespaced to be told apart.
+        """
+        docnames = self.objects.setdefault((objtype, name), {})
+        for docname, (_, other_title, other_source) in docnames.items():
+            if (other_title, other_source) != (title, source):
+                LOG.warning(
+                    'duplicate support matrix %s %s, other instance in %s',
+                    objtype,
+                    name,
+                    docname,
+                    location=location,
+                )
+                break
+        docnames[self.env.docname] = (anchor, title, source)
+
+    @property
+    def summaries(self) -> dict[str, dict[str, dict[str, Any]]]:
+        return self.data.setdefault('summaries', {})  # type: ignore[no-any-return]
+
+    def note_driver_summary(self, name: str, summary: dict[str, Any]) -> None:
+        self.summaries.setdefault(name, {})[self.env.docname] = summary
+
+    def get_driver_summaries(self) -> dict[str, dict[str, Any]]:
+        """Return the summary of each driver, keyed by badge name."""
+        return {
+            name: summaries[min(summaries)]
+            for name, summaries in self.summaries.items()
+        }
+
+    def clear_doc(self, docname: str) -> None:
+        for key, docnames in list(self.objects.items()):
+            docnames.pop(docname, None)
+            if not docnames:
+                del self.objects[key]
+        for name, summaries in list(self.summaries.items()):
+            summaries.pop(docname, None)
+            if not summaries:
+                del self.summaries[name]
+
+    def merge_domaindata(
+        self, docnames: Set[str], otherdata: dict[str, Any]
+    ) -> None:
+        for key, data in otherdata['objects'].items():
+            for docname, obj in data.items():
+                if docname in docnames:
+                    self.objects.setdefault(key, {})[docname] = obj
+        for name, summaries in otherdata.get('summaries', {}).items():
+            for docname, summary in summaries.items():
+                if docname in docnames:
+                    self.summaries.setdefault(name, {})[docname] = summary
+
+    def _get_object(
+        self, objtype: str, name: str
+    ) -> tuple[str, str, str, str] | None:
+        """Return the docname, anchor, title and source of an object.
+
+        As in a serial build, an object rendered by several documents
+        resolves to the first of them.
+        """
+        docnames = self.objects.get((objtype, name))
+        if not docnames:
+            return None
+        docname = min(docnames)
+        return (docname, *docnames[docname])
+
+    def _find_object(
+        self, objtype: str, target: str
+    ) -> tuple[str, str, str, str] | None:
+        prefix = DRIVER_PREFIX if objtype == 'driver' else FEATURE_PREFIX
+        for name in (target, prefix + target):
+            obj = self._get_object(objtype, name)
+            if obj is not None:
+                return obj
+        return None
+
+    def resolve_xref(
+        self,
+        env: BuildEnvironment,
+        fromdocname: str,
+        builder: Builder,
+        typ: str,
+        target: str,
+        node: addnodes.pending_xref,
+        contnode: nodes.Element,
+    ) -> nodes.reference | None:
+        obj = self._find_object(typ, target)
+        if obj is None:
+            return None
+
+        docname, anchor, title, _ = obj
+        if not node.get('refexplicit'):
+            contnode = nodes.inline(text=title)
+        return make_refnode(
+            builder, fromdocname, docname, anchor, contnode, title
+        )
+
+    def resolve_any_xref(
+        self,
+        env: BuildEnvironment,
+        fromdocname: str,
+        builder: Builder,
+        target: str,
+        node: addnodes.pending_xref,
+        contnode: nodes.Element,
+    ) -> list[tuple[str, nodes.reference]]:
+        results = []
+        for objtype in self.object_types:
+            ref = self.resolve_xref(
+                env, fromdocname, builder, objtype, target, node, contnode
+            )
+            if ref is not None:
+                results.append((f'sm:{objtype}', ref))
+        return results
+
+    def get_objects(self) -> Iterator[tuple[str, str, str, str, str, int]]:
+        for objtype, name in self.objects:
+            docname, anchor, title, _ = cast(
+                tuple[str, str, str, str], self._get_object(objtype, name)
+            )
+            yield name, title, objtype, docname, anchor, 1
+
+
+BADGE_TEMPLATE = """\
+<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="20" \
+role="img" aria-label="{label}: {message}">
+<title>{label}: {message}</title>
+<rect width="{label_width}" height="20" fill="#555"/>
+<rect x="{label_width}" width="{message_width}" height="20" fill="{color}"/>
+<g fill="#fff" text-anchor="middle" \
+font-family="Verdana,Geneva,DejaVu Sans,sans-serif" font-size="11">
+<text x="{label_x}" y="14">{label}</text>
+<text x="{message_x}" y="14">{message}</text>
+</g>
+</svg>
+"""
+
+
+def _render_badge(summary: dict[str, Any]) -> str:
+    """Render a coverage badge for a driver summary as SVG."""
+    label = saxutils.escape(summary['title'], {'"': '&quot;'})
+    message = f"{summary['coverage']:.0%}"
+
+    if summary['coverage'] >= 0.8:
+        color = "#4c1"
+    elif summary['coverage'] >= 0.5:
+        color = "#dfb317"
+    else:
+        color = "#e05d44"
+
+    # a rough estimate of the width of the text, there is no font metrics
+    # to rely on
+    label_width = 7 * len(summary['title']) + 10
+    message_width = 7 * len(message) + 10
+    return BADGE_TEMPLATE.format(
+        width=label_width + message_width,
+        label=label,
+        message=message,
+        color=color,
+        label_width=label_width,
+        message_width=message_width,
+        label_x=label_width / 2,
+        message_x=label_width + message_width / 2,
+    )
+
+
+def _write_badges(
+    outdir: str, summaries: dict[str, dict[str, Any]]
+) -> list[str]:
+    """Write the badge and JSON summary of each driver.
+
+    The hash of the summary of each driver is kept in a manifest, and
+    the files of the drivers whose summary did not change since the
+    previous build are left as is. The files of the drivers which are no
+    longer part of any matrix are removed.
+
+    :param summaries: Maps the names of the badges, which are paths
+        relative to the output directory without extension, to the driver
+        summaries
+    :returns: The names of the badges which were written.
+    """
+    os.makedirs(outdir, exist_ok=True)
+    manifest_path = path.join(outdir, 'manifest.json')
+
+    manifest = {}
+    if path.exists(manifest_path):
+        with open(manifest_path) as fp:
+            manifest = json.load(fp)
+
+    hashes = {
+        name: hashlib.sha256(
+            json.dumps(summary, sort_keys=True).encode()
+        ).hexdigest()
+        for name, summary in summaries.items()
+    }
+
+    def _write(name: str) -> str | None:
+        basename = path.join(outdir, name)
+        os.makedirs(path.dirname(basename), exist_ok=True)
+        if (
+            manifest.get(name) == hashes[name]
+            and path.exists(basename + '.svg')
+            and path.exists(basename + '.json')
+        ):
+            return None
+
+        with open(basename + '.svg', 'w') as fp:
+            fp.write(_render_badge(summaries[name]))
+        with open(basename + '.json', 'w') as fp:
+            json.dump(summaries[name], fp, separators=(',', ':'))
+        return name
+
+    with futures.ThreadPoolExecutor() as executor:
+        written = [name for name in executor.map(_write, summaries) if name]
+
+    for name in manifest.keys() - hashes.keys():
+        basename = path.join(outdir, name)
+        for ext in ('.svg', '.json'):
+            try:
+                os.remove(basename + ext)
+            except FileNotFoundError:
+                pass
+        try:
+            # only succeeds once the directory is empty
+            os.rmdir(path.dirname(basename))
+        except OSError:
+            pass
+
+    if hashes != manifest:
+        with open(manifest_path, 'w') as fp:
+            json.dump(hashes, fp, indent=0, sort_keys=True)
+
+    return written
+
+
+DIRECTIVE_PATTERN = re.compile(
+    r"^(?P<indent>[ \t]*)\.\.[ \t]+(?P<name>support_matrix\w*)::(?P<args>.*)$"
+)
+OPTION_PATTERN = re.compile(r"^:(?P<name>[^:]+):(?P<value>.*)$")
+
+
+class DirectiveSource:
+    def __init__(
+        self,
+        name: str,
+        lineno: int,
+        arguments: list[str],
+        options: dict[str, str],
+        content: list[str],
+    ) -> None:
+        """A directive of this extension found in a source file.
+
+        :param name: The name of the directive
+        :param lineno: The line the directive starts at, from 1
+        :param arguments: The arguments of the directive
+        :param options: The raw values of the options of the directive
+        :param content: The lines of content of the directive
+        """
+        self.name = name
+        self.lineno = lineno
+        self.arguments = arguments
+        self.options = options
+        self.content = content
+
+
+def find_directives(text: str) -> list[DirectiveSource]:
+    """Find the directives of this extension in reStructuredText source.
+
+    This only looks at the markup of the directives themselves, so it is
+    much cheaper than parsing the document, but it doesn't handle
+    directives generated by other directives or included from other files.
+    """
+    lines = text.splitlines()
+    directives = []
+
+    for idx, line in enumerate(lines):
+        match = DIRECTIVE_PATTERN.match(line)
+        if match is None:
+            continue
+
+        # the block of the directive is made of the lines indented further
+        indent = len(match.group('indent').expandtabs())
+        block = []
+        for block_line in lines[idx + 1 :]:
+            stripped = block_line.strip()
+            if (
+                stripped
+                and len(block_line) - len(block_line.lstrip()) <= indent
+            ):
+                break
+            block.append(stripped)
+
+        options = {}
+        pos = 0
+        while pos < len(block):
+            option = OPTION_PATTERN.match(block[pos])
+            if option is None:
+                break
+            options[option.group('name')] = option.group('value').strip()
+            pos += 1
+
+        content = [line for line in block[pos:] if line]
+        directives.append(
+            DirectiveSource(
+                match.group('name'),
+                idx + 1,
+                match.group('args').split(),
+                options,
+                content,
+            )
+        )
+
+    return directives
+
+
+def _find_matrix_files(
+    env: BuildEnvironment, docname: str, directive: DirectiveSource
+) -> list[str]:
+    """Return the paths to the INI files used by a directive."""
+    fnames: list[str] = []
+    if directive.name == 'support_matrix':
+        fnames = directive.arguments[:1]
+    elif directive.name == 'support_matrix_diff':
+        fnames = directive.arguments[:2]
+    elif directive.name == 'support_matrix_aggregate':
+        registry = env.config.support_matrix_registry
+        for line in directive.content:
+            fnames.append(_aggregate_entry(line, registry)[1])
+
+    return [str(env.relfn2path(fname, docname)[1]) for fname in fnames]
+
+
+class SupportMatrixBuilder(Builder):
+    """Export the support matrices used by the documentation.
+
+    The documents are not read, except for the root document which Sphinx
+    requires. Instead, the directives of this extension
+    are found by scanning the sources, and the matrices they render are
+    written to ``support-matrix.json`` and ``support-matrix.csv`` along
+    with the URLs of their anchors in the HTML documentation.
+    """
+
+    name = 'supportmatrix'
+    format = 'supportmatrix'
+    epilog = 'The support matrix exports are in %(outdir)s.'
+
+    CSV_FIELDS = [
+        'docname',
+        'source',
+        'feature',
+        'feature_title',
+        'feature_status',
+        'driver',
+        'driver_title',
+        'status',
+        'notes',
+        'url',
+    ]
+
+    def get_outdated_docs(self) -> str:
+        return 'all support matrices'
+
+    def get_target_uri(self, docname: str, typ: str | None = None) -> str:
+        # the anchors live in the HTML documentation
+        baseurl = cast(str, self.config.html_baseurl)
+        if baseurl and not baseurl.endswith('/'):
+            baseurl += '/'
+        suffix = self.config.html_file_suffix or '.html'
+        return urllib.parse.urljoin(baseurl, docname + suffix)
+
+    def prepare_writing(self, docnames: Set[str]) -> None:
+        pass
+
+    def write_documents(self, docnames: Set[str]) -> None:
+        # there are no documents to write, see finish()
+        pass
+
+    def write_doc(self, docname: str, doctree: nodes.document) -> None:
+        pass
+
+    def finish(self) -> None:
+        exports = []
+        for docname in sorted(self.env.found_docs):
+            try:
+                with open(
+                    self.env.doc2path(docname),
+                    encoding=self.config.source_encoding,
+                ) as fp:
+                    text = fp.read()
+            except (OSError, UnicodeDecodeError) as exc:
+                LOG.warning('cannot read %s: %s', docname, exc)
+                continue
+
+            for directive in find_directives(text):
+                exports.extend(self._export_directive(docname, directive))
+
+        with open(path.join(self.outdir, 'support-matrix.json'), 'w') as fp:
+            json.dump(exports, fp, indent=2)
+
+        with open(
+            path.join(self.outdir, 'support-matrix.csv'), 'w', newline=''
+        ) as fp:
+            writer = csv.DictWriter(fp, fieldnames=self.CSV_FIELDS)
+            writer.writeheader()
+            for export in exports:
+                drivers = {d['key']: d for d in export['drivers']}
+                for feature in export['features']:
+                    for impl in feature['implementations']:
+                        writer.writerow(
+                            {
+                                'docname': export['docname'],
+                                'source': export['source'],
+                                'feature': feature['key'],
+                                'feature_title': feature['title'],
+                                'feature_status': feature['status'],
+                                'driver': impl['driver'],
+                                'driver_title': drivers[impl['driver']][
+                                    'title'
+                                ],
+                                'status': impl['status'],
+                                'notes': impl['notes'],
+                                'url': impl['url'],
+                            }
+                        )
+
+    def _export_directive(
+        self, docname: str, directive: DirectiveSource
+    ) -> list[dict[str, Any]]:
+        """Export the matrices rendered by a directive.
+
+        :returns: One export for each matrix, as rendered by the directive
+        """
+        if directive.name == 'support_matrix':
+            entries = [('', directive.arguments[0])]
+        elif directive.name == 'support_matrix_aggregate':
+            registry = self.config.support_matrix_registry
+            entries = []
+            for line in directive.content:
+                name, fname = _aggregate_entry(line, registry)
+                entries.append((f"{name}_", fname))
+        else:
+            return []
+
+        exports = []
+        for prefix, fname in entries:
+            rel_fpath, fpath = self.env.relfn2path(fname, docname)
+            try:
+                matrix = load_support_matrix(fpath)
+            except Exception as exc:
+                LOG.warning(
+                    'cannot load support matrix %s: %s',
+                    rel_fpath,
+                    exc,
+                    location=(docname, directive.lineno),
+                )
+                continue
+
+            exports.append(
+                self._export_matrix(
+                    docname, directive, str(rel_fpath), matrix, prefix
+                )
+            )
+        return exports
+
+    def _export_matrix(
+        self,
+        docname: str,
+        directive: DirectiveSource,
+        source: str,
+        matrix: Matrix,
+        prefix: str,
+    ) -> dict[str, Any]:
+        uri = self.get_target_uri(docname)
+
+        def _url(key: str) -> str:
+            return f"{uri}#{re.sub(KEY_PATTERN, '_', prefix + key)}"
+
+        return {
+            'docname': docname,
+            'lineno': directive.lineno,
+            'directive': directive.name,
+            'source': source,
+            'options': directive.options,
+            'drivers': [
+                {
+                    'key': key,
+                    'title': driver.title,
+                    'link': driver.link,
+                    'url': _url(key),
+                }
+                for key, driver in matrix.drivers.items()
+            ],
+            'features': [
+                {
+                    'key': feature.key,
+                    'title': feature.title,
+                    'status': feature.status,
+                    'group': feature.group,
+                    'notes': feature.notes,
+                    'cli': feature.cli,
+                    'api': feature.api,
+                    'url': _url(feature.key),
+                    'implementations': [
+                        {
+                            'driver': key,
+                            'status': impl.status,
+                            'notes': impl.notes,
+                            'url': _url(f"{feature.key}_{key}"),
+                        }
+                        for key, impl in feature.implementations.items()
+                    ],
+                }
+                for feature in matrix.features
+            ],
+        }
+
+
+def on_env_before_read_docs_skip(
+    app: sphinx.application.Sphinx, env: BuildEnvironment, docnames: list[str]
+) -> None:
+    if isinstance(app.builder, SupportMatrixBuilder):
+        # the builder scans the sources itself. Sphinx insists on the root
+        # document having been read, so only read that one if needed; the
+        # documents left unread stay outdated for the other builders.
+        root_doc = app.config.root_doc
+        keep = root_doc in docnames and root_doc not in env.all_docs
+        docnames[:] = [root_doc] if keep else []
+
+
+def _find_doc_directives(
+    env: BuildEnvironment, docname: str
+) -> list[DirectiveSource]:
+    """Find the directives of this extension in the source of a document."""
+    try:
+        with open(
+            env.doc2path(docname), encoding=env.config.source_encoding
+        ) as fp:
+            text = fp.read()
+    except (OSError, UnicodeDecodeError):
+        return []
+
+    return find_directives(text)
+
+
+def on_env_before_read_docs_history(
+    app: sphinx.application.Sphinx, env: BuildEnvironment, docnames: list[str]
+) -> None:
+    """Record the snapshots of the matrices before the documents are read.
+
+    A snapshot is recorded for each ``support_matrix`` directive with a
+    ``history`` option, provided the ``support_matrix_release`` configuration
+    option is set. Doing so before reading the documents means the trend of
+    a history file always includes the release being built, whatever the
+    order the documents are read in. The documents using a history file
+    which changed are read again.
+    """
+    release = env.config.support_matrix_release
+    if not release:
+        return
+
+    changed = set()
+    for docname in list(docnames):
+        for directive in _find_doc_directives(env, docname):
+            if (
+                directive.name != 'support_matrix'
+                or not directive.arguments
+                or 'history' not in directive.options
+            ):
+                continue
+
+            _, fpath = env.relfn2path(directive.arguments[0], docname)
+            _, history = env.relfn2path(directive.options['history'], docname)
+            try:
+                matrix = load_support_matrix(fpath)
+            except Exception as exc:
+                # the directive will report the error in the context of
+                # the document
+                LOG.debug('not recording support matrix %s: %s', fpath, exc)
+                continue
+
+            try:
+                if get_snapshot_store(history).append(release, matrix):
+                    changed.add(path.abspath(history))
+            except OSError as exc:
+                LOG.warning(
+                    'cannot record support matrix history %s: %s',
+                    directive.options['history'],
+                    exc,
+                    location=(docname, directive.lineno),
+                )
+
+    if not changed:
+        return
+
+    for docname in sorted(env.found_docs - set(docnames)):
+        if any(
+            path.abspath(path.join(env.srcdir, dep)) in changed
+            for dep in env.dependencies.get(docname, ())
+        ):
+            docnames.append(docname)
+
+
+def on_env_before_read_docs(
+    app: sphinx.application.Sphinx, env: BuildEnvironment, docnames: list[str]
+) -> None:
+    """Share the matrices used by the documents with the parallel readers.
+
+    The sources are only scanned if Sphinx is about to fork readers, as
+    sharing brings nothing to a serial build.
+    """
+    if not parallel_available or app.parallel <= 1:
+        return
+
+    fpaths = set()
+    for docname in docnames:
+        for directive in _find_doc_directives(env, docname):
+            fpaths.update(_find_matrix_files(env, docname, directive))
+
+    for fpath in sorted(fpaths):
+        try:
+            share_support_matrix(fpath)
+        except Exception as exc:
+            # the reader will report the error in the context of the
+            # document
+            LOG.debug('not sharing support matrix %s: %s', fpath, exc)
+
+
+def on_builder_inited(app: sphinx.application.Sphinx) -> None:
+    # the matrices parsed by the previous build
+    _MATRIX_CACHE.restore(path.join(app.doctreedir, MATRIX_CACHE_FILENAME))
+
+
+def on_env_updated(
+    app: sphinx.application.Sphinx, env: BuildEnvironment
+) -> list[str]:
+    # all the documents were read
+    unshare_support_matrices()
+    try:
+        _MATRIX_CACHE.save(path.join(app.doctreedir, MATRIX_CACHE_FILENAME))
+    except OSError as exc:
+        LOG.debug('not saving support matrix cache: %s', exc)
+    return []
+
+
 def on_build_finished(
     app: sphinx.application.Sphinx, exc: BaseException | None
 ) -> None:
-    if exc is None:
+    # in case reading the documents failed
+    unshare_support_matrices()
+
+    if exc is None and app.builder.format == 'html':
         src = path.join(
             path.abspath(path.dirname(__file__)), 'support-matrix.css'
         )
         dst = path.join(app.outdir, '_static')
-        copy_asset(src, dst)
+        css = path.join(dst, 'support-matrix.css')
+        if not path.exists(css) or not filecmp.cmp(src, css, shallow=False):
+            copy_asset(src, dst)
+
+
+def on_build_finished_badges(
+    app: sphinx.application.Sphinx, exc: BaseException | None
+) -> None:
+    if (
+        exc is None
+        and app.builder.format == 'html'
+        and app.config.support_matrix_badges
+    ):
+        domain = app.env.get_domain('sm')
+        summaries = cast(SupportMatrixDomain, domain).get_driver_summaries()
+        if summaries:
+            _write_badges(
+                path.join(app.outdir, '_static', 'support-matrix'), summaries
+            )
 
 
 def setup(app: sphinx.application.Sphinx) -> dict[str, Any]:
+    app.add_domain(SupportMatrixDomain)
     app.add_directive('support_matrix', Directive)
+    app.add_directive('support_matrix_trend', TrendDirective)
+    app.add_directive('support_matrix_aggregate', AggregateDirective)
+    app.add_directive('support_matrix_diff', DiffDirective)
+    app.add_config_value('support_matrix_registry', {}, 'env', [dict])
+    app.add_config_value('support_matrix_release', None, 'env', [str])
+    app.add_config_value('support_matrix_badges', False, 'html', [bool])
     app.add_css_file('support-matrix.css')
+    # the builder relies on Builder.write_documents() to skip writing the
+    # documents it did not read
+    if sphinx.version_info >= (8, 1):
+        app.add_builder(SupportMatrixBuilder)
+    app.connect('builder-inited', on_builder_inited)
+    app.connect(
+        'env-before-read-docs', on_env_before_read_docs_skip, priority=100
+    )
+    app.connect('env-before-read-docs', on_env_before_read_docs_history)
+    app.connect('env-before-read-docs', on_env_before_read_docs)
+    app.connect('env-updated', on_env_updated)
     app.connect('build-finished', on_build_finished)
+    app.connect('build-finished', on_build_finished_badges)
     return {
         'parallel_read_safe': True,
         'parallel_write_safe': True,
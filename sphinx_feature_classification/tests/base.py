@@ -13,8 +13,76 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import configparser
+import io
+import os
+import shutil
+
+import fixtures
+import sphinx.application
+from sphinx.util import docutils
 import testtools
 
+FAKE_MATRIX = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'fakes', 'support-matrix.ini'
+)
+
 
 class TestCase(testtools.TestCase):
     """Test case base class for all unit tests."""
+
+    @staticmethod
+    def load_fake_config():
+        """Parse the fake support-matrix.ini file."""
+        cfg = configparser.ConfigParser()
+        with open(FAKE_MATRIX) as fp:
+            cfg.read_file(fp)
+        return cfg
+
+
+class SphinxTestCase(TestCase):
+    """Test case building a Sphinx project in a temporary directory."""
+
+    def setUp(self):
+        super().setUp()
+
+        self.srcdir = self.useFixture(fixtures.TempDir()).path
+        self.outdir = os.path.join(self.srcdir, '_build')
+        self.write_file(
+            'conf.py',
+            "extensions = ['sphinx_feature_classification.support_matrix']\n",
+        )
+
+    def write_file(self, fname, data):
+        """Write a file of the project."""
+        with open(os.path.join(self.srcdir, fname), 'w') as fp:
+            fp.write(data)
+
+    def copy_fake_matrix(self, fname='support-matrix.ini'):
+        """Copy the fake support-matrix.ini file to the project."""
+        fpath = os.path.join(self.srcdir, fname)
+        os.makedirs(os.path.dirname(fpath), exist_ok=True)
+        shutil.copy(FAKE_MATRIX, fpath)
+
+    def build(self, buildername='html', outdir=None):
+        """Build the project.
+
+        :param outdir: The output directory, the doctrees are always kept
+            in the default one
+        :returns: The Sphinx application and the warnings it emitted
+        """
+        warnings = io.StringIO()
+        # keep the nodes and directives registered by Sphinx from leaking
+        # into the next build
+        with docutils.docutils_namespace():
+            app = sphinx.application.Sphinx(
+                self.srcdir,
+                self.srcdir,
+                outdir or self.outdir,
+                os.path.join(self.outdir, '.doctrees'),
+                buildername,
+                status=None,
+                warning=warnings,
+            )
+            app.build()
+        return app, warnings.getvalue()
@@ -18,15 +18,33 @@ Tests for `sphinx_feature_classification` module.
 """
 
 import configparser
+import csv
+import json
+import multiprocessing
 import os
+import shutil
+from unittest import mock
 
 import ddt
+from docutils import nodes
 import fixtures
 
 from sphinx_feature_classification import support_matrix
 from sphinx_feature_classification.tests import base
 
 
+_LOAD_IN_WORKER = support_matrix._load_in_worker
+_WORKERS_BARRIER = multiprocessing.get_context('fork').Barrier(2)
+
+
+def _load_in_worker_together(fpath):
+    # only returns if another worker is loading a matrix at the same time
+    _WORKERS_BARRIER.wait(timeout=30)
+    matrix, entry = _LOAD_IN_WORKER(fpath)
+    matrix.pid = os.getpid()  # type: ignore
+    return matrix, entry
+
+
 @ddt.ddt
 class MatrixTestCase(base.TestCase):
     def setUp(self):
@@ -82,7 +100,11 @@ class MatrixTestCase(base.TestCase):
         self.assertEqual(notes, fake_implementation.notes)
 
     def test_on_build_finished(self):
+        class FakeBuilder:
+            format = 'html'
+
         class FakeApp:
+            builder = FakeBuilder()
             outdir = self.useFixture(fixtures.TempDir()).path
 
         app = FakeApp()
@@ -92,3 +114,1052 @@ class MatrixTestCase(base.TestCase):
             app.outdir, '_static', 'support-matrix.css'
         )
         self.assertTrue(os.path.isfile(expected_file))
+
+
+class SnapshotStoreTestCase(base.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.cfg = self.load_fake_config()
+        self.fpath = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'history.jsonl'
+        )
+
+    def test_append_stores_changed_cells_only(self):
+        store = support_matrix.SnapshotStore(self.fpath)
+        self.assertTrue(
+            store.append('2024.1', support_matrix.Matrix(self.cfg))
+        )
+
+        self.cfg.set('operation.Cool_Feature', 'driver.bar', 'complete')
+        self.assertTrue(
+            store.append('2024.2', support_matrix.Matrix(self.cfg))
+        )
+
+        with open(self.fpath) as fp:
+            entries = [json.loads(line) for line in fp]
+
+        self.assertEqual(2, len(entries))
+        self.assertEqual(
+            {
+                'release': '2024.2',
+                'cells': {
+                    'operation.Cool_Feature': {'driver.bar': 'complete'}
+                },
+            },
+            entries[1],
+        )
+        self.assertEqual(['2024.1', '2024.2'], store.releases)
+
+    def test_append_unchanged_release(self):
+        store = support_matrix.SnapshotStore(self.fpath)
+        matrix = support_matrix.Matrix(self.cfg)
+        self.assertTrue(store.append('2024.1', matrix))
+        self.assertFalse(store.append('2024.1', matrix))
+
+    def test_append_unchanged_older_release(self):
+        store = support_matrix.SnapshotStore(self.fpath)
+        old = support_matrix.Matrix(self.cfg)
+        self.cfg.set('operation.Cool_Feature', 'driver.bar', 'complete')
+        new = support_matrix.Matrix(self.cfg)
+
+        self.assertTrue(store.append('2024.1', old))
+        self.assertTrue(store.append('2024.2', new))
+        # rebuilding the docs of either release must not grow the history
+        self.assertFalse(store.append('2024.1', old))
+        self.assertFalse(store.append('2024.2', new))
+
+        with open(self.fpath) as fp:
+            self.assertEqual(2, len(fp.readlines()))
+
+    def test_trend(self):
+        store = support_matrix.SnapshotStore(self.fpath)
+        store.append('2024.1', support_matrix.Matrix(self.cfg))
+
+        self.cfg.remove_section('driver.foo')
+        self.cfg.remove_option('operation.Cool_Feature', 'driver.foo')
+        self.cfg.set('operation.Cool_Feature', 'driver.bar', 'complete')
+        store.append('2024.2', support_matrix.Matrix(self.cfg))
+
+        # a fresh store must rebuild the same history from the file
+        store = support_matrix.SnapshotStore(self.fpath)
+        self.assertEqual(
+            [('2024.1', 0.5), ('2024.2', 1.0)], store.trend('driver.bar')
+        )
+        self.assertEqual(
+            [('2024.1', 1.0), ('2024.2', None)], store.trend('driver.foo')
+        )
+
+
+class SnapshotHistoryBuildTestCase(base.SphinxTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.copy_fake_matrix()
+        self.write_file(
+            'conf.py',
+            "extensions = ['sphinx_feature_classification.support_matrix']\n"
+            "support_matrix_release = '2024.1'\n",
+        )
+        # the trend is read before the matrix recording the history
+        self.write_file(
+            'index.rst',
+            'Trend\n'
+            '=====\n'
+            '\n'
+            '.. support_matrix_trend:: history.jsonl\n'
+            '   :drivers: driver.foo\n'
+            '\n'
+            '.. toctree::\n'
+            '\n'
+            '   matrix\n',
+        )
+        self.write_file(
+            'matrix.rst',
+            'Support Matrix\n'
+            '==============\n'
+            '\n'
+            '.. support_matrix:: support-matrix.ini\n'
+            '   :history: history.jsonl\n',
+        )
+
+    def _trend(self, app):
+        doctree = app.env.get_doctree('index')
+        return [
+            [entry.astext() for entry in row.findall(nodes.entry)]
+            for row in doctree.findall(nodes.row)
+        ]
+
+    def test_trend_includes_release_being_built(self):
+        app, warnings = self.build()
+
+        self.assertEqual('', warnings)
+        self.assertEqual(
+            [
+                ['Driver', '2024.1', 'Trend'],
+                ['Foo Driver', '100%', '\u2588'],
+            ],
+            self._trend(app),
+        )
+
+    def test_trend_read_again_when_history_changes(self):
+        self.build()
+
+        fpath = os.path.join(self.srcdir, 'support-matrix.ini')
+        with open(fpath) as fp:
+            data = fp.read()
+        with open(fpath, 'w') as fp:
+            fp.write(data.replace('driver.foo=complete', 'driver.foo=missing'))
+        # make sure the change is seen even on coarse file systems
+        mtime = os.stat(fpath).st_mtime + 10
+        os.utime(fpath, (mtime, mtime))
+
+        app, warnings = self.build()
+
+        self.assertEqual('', warnings)
+        self.assertEqual(
+            [
+                ['Driver', '2024.1', 'Trend'],
+                ['Foo Driver', '0%', '\u2581'],
+            ],
+            self._trend(app),
+        )
+
+
+class LoadSupportMatricesTestCase(base.TestCase):
+    def test_load_support_matrices(self):
+        tempdir = self.useFixture(fixtures.TempDir()).path
+        with open(base.FAKE_MATRIX) as fp:
+            data = fp.read()
+
+        fpaths = []
+        for idx in range(4):
+            fpath = os.path.join(tempdir, f'matrix-{idx}.ini')
+            with open(fpath, 'w') as fp:
+                fp.write(data.replace('Foo Driver', f'Foo Driver {idx}'))
+            fpaths.append(fpath)
+
+        matrices = support_matrix.load_support_matrices(fpaths)
+
+        self.assertEqual(
+            [f'Foo Driver {idx}' for idx in range(4)],
+            [matrix.drivers['driver.foo'].title for matrix in matrices],
+        )
+        self.assertEqual(1.0, matrices[0].coverage('driver.foo'))
+        self.assertEqual(0.5, matrices[0].coverage('driver.bar'))
+        self.assertIsNone(matrices[0].coverage('driver.baz'))
+
+    def test_load_support_matrices_concurrently(self):
+        tempdir = self.useFixture(fixtures.TempDir()).path
+        fpaths = []
+        for idx in range(2):
+            fpath = os.path.join(tempdir, f'matrix-{idx}.ini')
+            shutil.copy(base.FAKE_MATRIX, fpath)
+            fpaths.append(fpath)
+
+        with mock.patch.object(
+            support_matrix, '_load_in_worker', _load_in_worker_together
+        ):
+            matrices = support_matrix.load_support_matrices(
+                fpaths, max_workers=2
+            )
+
+        # both files were parsed at once, in other processes
+        pids = {matrix.pid for matrix in matrices}  # type: ignore
+        self.assertEqual(2, len(pids))
+        self.assertNotIn(os.getpid(), pids)
+        # and the parsed matrices were cached here
+        self.assertEqual(
+            matrices, support_matrix.load_support_matrices(fpaths)
+        )
+
+
+@ddt.ddt
+class SummaryLayoutTestCase(base.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        cfg = configparser.ConfigParser()
+        for idx in range(5):
+            cfg[f'driver.d{idx}'] = {'title': f'Driver {idx}'}
+        cfg['operation.one'] = {
+            'title': 'One',
+            **{f'driver.d{idx}': 'complete' for idx in range(5)},
+        }
+        self.matrix = support_matrix.Matrix(cfg)
+
+    @staticmethod
+    def _refids(content):
+        return {
+            node['refid']
+            for table in content
+            for node in table.findall(nodes.reference)
+            if 'refid' in node
+        }
+
+    @ddt.unpack
+    @ddt.data(
+        {'transposed': False, 'chunk_size': None, 'tables': 1},
+        {'transposed': False, 'chunk_size': 2, 'tables': 3},
+        {'transposed': True, 'chunk_size': None, 'tables': 1},
+    )
+    def test_build_summary(self, transposed, chunk_size, tables):
+        content: list[nodes.Element] = []
+        support_matrix.Directive._build_summary(
+            self.matrix, content, transposed=transposed, chunk_size=chunk_size
+        )
+        self.assertEqual(tables, len(content) - 1)
+
+        # the links into the details must not depend on the layout
+        expected: list[nodes.Element] = []
+        support_matrix.Directive._build_summary(self.matrix, expected)
+        self.assertEqual(self._refids(expected), self._refids(content))
+
+
+class MatrixCacheTestCase(base.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.fpath = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'support-matrix.ini'
+        )
+        self.mtime = 0
+        self.cache = support_matrix.MatrixCache()
+        self._write(
+            '[driver.foo]\n'
+            'title=Foo Driver\n'
+            '\n'
+            '[operation.one]\n'
+            'title=One\n'
+            'driver.foo=complete\n'
+            '\n'
+            '[operation.two]\n'
+            'title=Two\n'
+            'driver.foo=missing\n'
+        )
+
+    def _write(self, data):
+        with open(self.fpath, 'w') as fp:
+            fp.write(data)
+        # make sure the change is noticed, whatever the clock resolution
+        self.mtime += 1_000_000_000
+        os.utime(self.fpath, ns=(self.mtime, self.mtime))
+
+    def _replace(self, old, new):
+        with open(self.fpath) as fp:
+            data = fp.read()
+        self._write(data.replace(old, new))
+
+    def test_load_unchanged(self):
+        matrix = self.cache.load(self.fpath)
+        self.assertIs(matrix, self.cache.load(self.fpath))
+
+    def test_load_changed_feature(self):
+        matrix = self.cache.load(self.fpath)
+        one, two = matrix.features
+
+        self._replace('driver.foo=missing', 'driver.foo=partial')
+
+        self.assertIs(matrix, self.cache.load(self.fpath))
+        self.assertIs(one, matrix.features[0])
+        self.assertIsNot(two, matrix.features[1])
+        self.assertEqual(
+            'partial', matrix.features[1].implementations['driver.foo'].status
+        )
+
+    def test_load_changed_driver(self):
+        matrix = self.cache.load(self.fpath)
+        features = list(matrix.features)
+
+        self._replace('title=Foo Driver', 'title=Better Foo Driver')
+
+        self.assertIs(matrix, self.cache.load(self.fpath))
+        self.assertEqual(
+            'Better Foo Driver', matrix.drivers['driver.foo'].title
+        )
+        self.assertEqual(features, matrix.features)
+
+    def test_load_removed_feature(self):
+        matrix = self.cache.load(self.fpath)
+
+        self._replace('[operation.one]\ntitle=One\ndriver.foo=complete\n', '')
+
+        self.assertIs(matrix, self.cache.load(self.fpath))
+        self.assertEqual(
+            ['operation.two'], [feature.key for feature in matrix.features]
+        )
+
+    def test_load_added_driver(self):
+        matrix = self.cache.load(self.fpath)
+
+        self._replace(
+            '\n[operation.one]', '[driver.bar]\ntitle=Bar\n\n[operation.one]'
+        )
+
+        new_matrix = self.cache.load(self.fpath)
+        self.assertIsNot(matrix, new_matrix)
+        self.assertEqual(
+            ['driver.foo', 'driver.bar'], list(new_matrix.drivers)
+        )
+
+    def test_load_header_comment(self):
+        self._replace('[driver.foo]', '[driver.foo] ; the reference driver')
+        matrix = self.cache.load(self.fpath)
+
+        self._replace('driver.foo=missing', 'driver.foo=partial')
+
+        self.assertIs(matrix, self.cache.load(self.fpath))
+        self.assertEqual(['driver.foo'], list(matrix.drivers))
+        self.assertEqual(
+            'partial', matrix.features[1].implementations['driver.foo'].status
+        )
+
+    def test_save_restore(self):
+        cache_file = os.path.join(os.path.dirname(self.fpath), 'cache')
+        matrix = self.cache.load(self.fpath)
+        self.cache.save(cache_file)
+
+        self._replace('driver.foo=missing', 'driver.foo=partial')
+
+        cache = support_matrix.MatrixCache()
+        cache.restore(cache_file)
+        restored = cache.load(self.fpath)
+        self.assertEqual(matrix.features[0].title, restored.features[0].title)
+        self.assertIs(restored, cache.load(self.fpath))
+        self.assertEqual(
+            'partial',
+            restored.features[1].implementations['driver.foo'].status,
+        )
+
+    def test_restore_invalid(self):
+        cache_file = os.path.join(os.path.dirname(self.fpath), 'cache')
+        with open(cache_file, 'wb') as fp:
+            fp.write(b'garbage')
+
+        self.cache.restore(cache_file)
+        self.cache.restore(cache_file + '.missing')
+        self.assertEqual(
+            ['driver.foo'], list(self.cache.load(self.fpath).drivers)
+        )
+
+    def test_load_invalid_feature(self):
+        matrix = self.cache.load(self.fpath)
+
+        self._replace('driver.foo=missing', 'driver.foo=maybe')
+
+        self.assertRaises(ValueError, self.cache.load, self.fpath)
+        self.assertEqual(
+            'missing', matrix.features[1].implementations['driver.foo'].status
+        )
+
+
+class AggregateDirectiveTestCase(base.SphinxTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.copy_fake_matrix('compute/support-matrix.ini')
+        self.copy_fake_matrix('volume/support-matrix.ini')
+
+    def _build(self, content):
+        self.write_file(
+            'index.rst',
+            'Support Matrix\n'
+            '==============\n'
+            '\n'
+            '.. support_matrix_aggregate::\n'
+            '\n' + ''.join(f'   {line}\n' for line in content),
+        )
+        return self.build()
+
+    def test_names(self):
+        app, warnings = self._build(
+            ['compute/support-matrix.ini', 'block = volume/support-matrix.ini']
+        )
+
+        self.assertEqual('', warnings)
+        doctree = app.env.get_doctree('index')
+        ids = [
+            id_
+            for node in doctree.findall(nodes.Element)
+            for id_ in node['ids']
+        ]
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertIn('compute_support_matrix', ids)
+        self.assertIn('block', ids)
+        self.assertIn('compute_support_matrix_driver_foo', ids)
+        self.assertIn('block_driver_foo', ids)
+        self.assertEqual(
+            [
+                'block.driver.bar',
+                'block.driver.foo',
+                'block.operation.Cool_Feature',
+                'compute/support-matrix.driver.bar',
+                'compute/support-matrix.driver.foo',
+                'compute/support-matrix.operation.Cool_Feature',
+            ],
+            sorted(obj[0] for obj in app.env.get_domain('sm').get_objects()),
+        )
+
+    def test_duplicate_names(self):
+        _, warnings = self._build(
+            ['compute/support-matrix.ini', 'compute/support-matrix.ini']
+        )
+
+        self.assertIn("Duplicate support matrix name", warnings)
+
+
+class SupportMatrixDomainTestCase(base.SphinxTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.copy_fake_matrix()
+        self.write_file(
+            'index.rst',
+            'Support Matrix\n'
+            '==============\n'
+            '\n'
+            '.. support_matrix:: support-matrix.ini\n'
+            '\n'
+            'See :sm:feature:`operation.Cool_Feature` and '
+            ':sm:driver:`foo`.\n',
+        )
+
+    def _write_other(self, fname, options=''):
+        self.write_file(
+            'other.rst',
+            ':orphan:\n'
+            '\n'
+            'Other\n'
+            '=====\n'
+            '\n'
+            f'.. support_matrix:: {fname}\n'
+            f'{options}',
+        )
+
+    def test_objects(self):
+        app, warnings = self.build()
+
+        self.assertEqual('', warnings)
+        self.assertEqual(
+            [
+                (
+                    'driver.bar',
+                    'Bar Driver',
+                    'driver',
+                    'index',
+                    'driver_bar',
+                    1,
+                ),
+                (
+                    'driver.foo',
+                    'Foo Driver',
+                    'driver',
+                    'index',
+                    'driver_foo',
+                    1,
+                ),
+                (
+                    'operation.Cool_Feature',
+                    'Cool Feature',
+                    'feature',
+                    'index',
+                    'operation_Cool_Feature',
+                    1,
+                ),
+            ],
+            sorted(app.env.get_domain('sm').get_objects()),
+        )
+
+        with open(os.path.join(self.outdir, 'index.html')) as fp:
+            html = fp.read()
+        self.assertIn('id="driver_foo"', html)
+        self.assertIn('href="#driver_foo"', html)
+        self.assertIn('href="#operation_Cool_Feature"', html)
+
+    def test_same_matrix_in_two_documents(self):
+        self._write_other('support-matrix.ini')
+
+        app, warnings = self.build()
+
+        self.assertEqual('', warnings)
+        domain = app.env.get_domain('sm')
+        self.assertEqual({'index'}, {obj[3] for obj in domain.get_objects()})
+
+    def test_same_matrix_removed_from_first_document(self):
+        self._write_other('support-matrix.ini')
+        self.build()
+
+        self.write_file(
+            'index.rst',
+            'Support Matrix\n==============\n\nSee :sm:driver:`foo`.\n',
+        )
+        app, warnings = self.build()
+
+        self.assertEqual('', warnings)
+        domain = app.env.get_domain('sm')
+        self.assertEqual({'other'}, {obj[3] for obj in domain.get_objects()})
+        with open(os.path.join(self.outdir, 'index.html')) as fp:
+            self.assertIn('href="other.html#driver_foo"', fp.read())
+
+    def test_duplicate_objects(self):
+        self.copy_fake_matrix('other.ini')
+        self._write_other('other.ini')
+
+        _, warnings = self.build()
+
+        self.assertIn(
+            os.path.join(self.srcdir, 'other.rst') + ':6: WARNING: '
+            'duplicate support matrix driver driver.foo',
+            warnings,
+        )
+
+    def test_namespace(self):
+        self.copy_fake_matrix('other.ini')
+        self._write_other('other.ini', '   :namespace: other\n')
+
+        app, warnings = self.build()
+
+        self.assertEqual('', warnings)
+        self.assertIn(
+            (
+                'other.driver.foo',
+                'Foo Driver',
+                'driver',
+                'other',
+                'driver_foo',
+                1,
+            ),
+            list(app.env.get_domain('sm').get_objects()),
+        )
+
+
+class DiffMatricesTestCase(base.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.cfg = self.load_fake_config()
+        self.old = support_matrix.Matrix(self.cfg)
+
+    def test_diff_unchanged(self):
+        self.assertEqual(
+            [],
+            support_matrix.diff_matrices(
+                self.old, support_matrix.Matrix(self.cfg)
+            ),
+        )
+
+    def test_diff(self):
+        self.cfg.remove_section('driver.foo')
+        self.cfg.remove_option('operation.Cool_Feature', 'driver.foo')
+        self.cfg['driver.baz'] = {'title': 'Baz Driver'}
+        self.cfg.set('operation.Cool_Feature', 'status', 'mandatory')
+        self.cfg.set('operation.Cool_Feature', 'notes', 'Still cool.')
+        self.cfg.set('operation.Cool_Feature', 'driver.bar', 'complete')
+        self.cfg.remove_option('operation.Cool_Feature', 'driver-notes.bar')
+        self.cfg['operation.New_Feature'] = {'title': 'New Feature'}
+        new = support_matrix.Matrix(self.cfg)
+
+        MatrixChange = support_matrix.MatrixChange
+        self.assertEqual(
+            [
+                MatrixChange(MatrixChange.DRIVER_ADDED, driver='driver.baz'),
+                MatrixChange(MatrixChange.DRIVER_REMOVED, driver='driver.foo'),
+                MatrixChange(
+                    MatrixChange.FEATURE_ADDED, feature='operation.New_Feature'
+                ),
+                MatrixChange(
+                    MatrixChange.FEATURE_STATUS,
+                    feature='operation.Cool_Feature',
+                    old='optional',
+                    new='mandatory',
+                ),
+                MatrixChange(
+                    MatrixChange.FEATURE_NOTES,
+                    feature='operation.Cool_Feature',
+                    old='A pretty darn cool feature.',
+                    new='Still cool.',
+                ),
+                MatrixChange(
+                    MatrixChange.IMPLEMENTATION_STATUS,
+                    feature='operation.Cool_Feature',
+                    driver='driver.bar',
+                    old='partial',
+                    new='complete',
+                ),
+                MatrixChange(
+                    MatrixChange.IMPLEMENTATION_NOTES,
+                    feature='operation.Cool_Feature',
+                    driver='driver.bar',
+                    old='Requires hardware support.',
+                    new=None,
+                ),
+            ],
+            support_matrix.diff_matrices(self.old, new),
+        )
+
+    def test_diff_snapshot(self):
+        self.cfg.set('operation.Cool_Feature', 'driver.bar', 'complete')
+        self.cfg.remove_option('operation.Cool_Feature', 'driver-notes.bar')
+        new = support_matrix.Matrix(self.cfg)
+
+        # notes are not part of snapshots
+        MatrixChange = support_matrix.MatrixChange
+        self.assertEqual(
+            [
+                MatrixChange(
+                    MatrixChange.IMPLEMENTATION_STATUS,
+                    feature='operation.Cool_Feature',
+                    driver='driver.bar',
+                    old='partial',
+                    new='complete',
+                ),
+            ],
+            support_matrix.diff_matrices(
+                support_matrix.Snapshot.from_matrix('2024.1', self.old), new
+            ),
+        )
+
+    def test_build_diff_one_sided_implementation(self):
+        MatrixChange = support_matrix.MatrixChange
+        changes = [
+            MatrixChange(
+                MatrixChange.IMPLEMENTATION_STATUS,
+                feature='operation.Cool_Feature',
+                driver='driver.foo',
+                new='complete',
+            ),
+            MatrixChange(
+                MatrixChange.IMPLEMENTATION_STATUS,
+                feature='operation.Cool_Feature',
+                driver='driver.bar',
+                old='partial',
+            ),
+        ]
+
+        (table,) = support_matrix.DiffDirective._build_diff(
+            self.old, self.old, changes
+        )
+
+        rows = list(table.findall(nodes.row))
+        self.assertEqual('Implementation added: complete', rows[1][2].astext())
+        self.assertEqual('Implementation removed', rows[2][2].astext())
+        self.assertNotIn(
+            'sp_impl_None',
+            [
+                cls
+                for node in table.findall(nodes.Element)
+                for cls in node['classes']
+            ],
+        )
+
+
+class BadgesTestCase(base.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.matrix = support_matrix.Matrix(self.load_fake_config())
+        self.outdir = self.useFixture(fixtures.TempDir()).path
+
+    def test_driver_summary(self):
+        self.assertEqual(
+            {
+                'driver': 'driver.bar',
+                'title': 'Bar Driver',
+                'link': 'https://docs.openstack.org',
+                'coverage': 0.5,
+                'statuses': {
+                    'complete': 0,
+                    'missing': 0,
+                    'partial': 1,
+                    'unknown': 0,
+                },
+                'features': {'operation.Cool_Feature': 'partial'},
+            },
+            support_matrix.driver_summary(self.matrix, 'driver.bar'),
+        )
+
+    def test_write_badges(self):
+        summaries = {
+            f"matrix/{key.replace('.', '_')}": support_matrix.driver_summary(
+                self.matrix, key
+            )
+            for key in self.matrix.drivers
+        }
+
+        self.assertEqual(
+            ['matrix/driver_foo', 'matrix/driver_bar'],
+            support_matrix._write_badges(self.outdir, summaries),
+        )
+        for name in ('driver_foo.svg', 'driver_foo.json', 'driver_bar.svg'):
+            self.assertTrue(
+                os.path.isfile(os.path.join(self.outdir, 'matrix', name))
+            )
+
+        # only the drivers whose summary changed are written again
+        summaries['matrix/driver_bar']['coverage'] = 1.0
+        self.assertEqual(
+            ['matrix/driver_bar'],
+            support_matrix._write_badges(self.outdir, summaries),
+        )
+        self.assertEqual(
+            [], support_matrix._write_badges(self.outdir, summaries)
+        )
+
+    def test_write_badges_removed_driver(self):
+        summaries = {
+            'one/driver_foo': support_matrix.driver_summary(
+                self.matrix, 'driver.foo'
+            ),
+            'two/driver_foo': support_matrix.driver_summary(
+                self.matrix, 'driver.foo'
+            ),
+        }
+        support_matrix._write_badges(self.outdir, summaries)
+
+        del summaries['two/driver_foo']
+        support_matrix._write_badges(self.outdir, summaries)
+
+        self.assertTrue(
+            os.path.isfile(os.path.join(self.outdir, 'one', 'driver_foo.svg'))
+        )
+        self.assertFalse(os.path.exists(os.path.join(self.outdir, 'two')))
+        with open(os.path.join(self.outdir, 'manifest.json')) as fp:
+            self.assertEqual(['one/driver_foo'], list(json.load(fp)))
+
+
+class BadgesBuildTestCase(base.SphinxTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.copy_fake_matrix()
+        self.write_file(
+            'index.rst',
+            'Support Matrix\n'
+            '==============\n'
+            '\n'
+            '.. support_matrix:: support-matrix.ini\n',
+        )
+        self.badges = os.path.join(self.outdir, '_static', 'support-matrix')
+
+    def _enable_badges(self):
+        self.write_file(
+            'conf.py',
+            "extensions = ['sphinx_feature_classification.support_matrix']\n"
+            "support_matrix_badges = True\n",
+        )
+
+    def test_badges_disabled(self):
+        _, warnings = self.build()
+
+        self.assertEqual('', warnings)
+        self.assertFalse(os.path.exists(self.badges))
+
+    def test_badges_html_only(self):
+        self._enable_badges()
+
+        _, warnings = self.build('text')
+
+        self.assertEqual('', warnings)
+        self.assertFalse(os.path.exists(os.path.join(self.outdir, '_static')))
+
+    def test_badges_per_matrix(self):
+        self._enable_badges()
+        self.copy_fake_matrix('compute/support-matrix.ini')
+        self.copy_fake_matrix('volume/support-matrix.ini')
+        self.write_file(
+            'index.rst',
+            'Support Matrix\n'
+            '==============\n'
+            '\n'
+            '.. support_matrix:: compute/support-matrix.ini\n'
+            '   :namespace: compute\n'
+            '\n'
+            '.. support_matrix_aggregate::\n'
+            '\n'
+            '   volume/support-matrix.ini\n',
+        )
+
+        _, warnings = self.build()
+
+        self.assertEqual('', warnings)
+        for directory in ('compute_support_matrix', 'volume_support_matrix'):
+            self.assertTrue(
+                os.path.isfile(
+                    os.path.join(self.badges, directory, 'driver_foo.svg')
+                )
+            )
+
+
+class SharedMatrixTestCase(base.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.config_file = base.FAKE_MATRIX
+        self.matrix = support_matrix.Matrix(self.load_fake_config())
+
+    def test_encode_decode(self):
+        data = support_matrix._encode_matrix(self.matrix)
+        matrix = support_matrix.SharedMatrix(memoryview(data))
+
+        self.assertEqual(
+            {key: vars(driver) for key, driver in self.matrix.drivers.items()},
+            {key: vars(driver) for key, driver in matrix.drivers.items()},
+        )
+        self.assertEqual(1, len(matrix.features))
+        feature = matrix.features[0]
+        expected = self.matrix.features[0]
+        for attr in ('key', 'title', 'status', 'group', 'notes', 'cli', 'api'):
+            self.assertEqual(getattr(expected, attr), getattr(feature, attr))
+        self.assertEqual(
+            {k: vars(v) for k, v in expected.implementations.items()},
+            {k: vars(v) for k, v in feature.implementations.items()},
+        )
+
+    def test_features_decoded_on_access(self):
+        self.matrix.features = [self.matrix.features[0]] * 3
+        data = support_matrix._encode_matrix(self.matrix)
+        matrix = support_matrix.SharedMatrix(memoryview(data))
+
+        self.assertEqual(3, len(matrix.features))
+        # nothing is kept between accesses
+        self.assertIsNot(matrix.features[0], matrix.features[0])
+        self.assertEqual(
+            ['operation.Cool_Feature'] * 2,
+            [feature.key for feature in matrix.features[1:]],
+        )
+        self.assertEqual('Cool Feature', matrix.features[-1].title)
+        self.assertRaises(IndexError, matrix.features.__getitem__, 3)
+        self.assertEqual(1.0, matrix.coverage('driver.foo'))
+
+    def test_share_support_matrix(self):
+        support_matrix.share_support_matrix(self.config_file)
+        self.addCleanup(support_matrix.unshare_support_matrices)
+
+        self.assertIn(self.config_file, support_matrix._SHARED_MATRICES)
+        support_matrix.unshare_support_matrices([self.config_file])
+        self.assertNotIn(self.config_file, support_matrix._SHARED_MATRICES)
+
+
+class SharedMatrixBuildTestCase(base.SphinxTestCase):
+    def test_features_decoded_once_per_directive(self):
+        matrix = support_matrix.Matrix(self.load_fake_config())
+        matrix.features = [
+            matrix.features[0],
+            matrix.features[0],
+            matrix.features[0],
+        ]
+        shared = support_matrix.SharedMatrix(
+            memoryview(support_matrix._encode_matrix(matrix))
+        )
+        self.copy_fake_matrix()
+        self.write_file(
+            'index.rst',
+            'Support Matrix\n'
+            '==============\n'
+            '\n'
+            '.. support_matrix:: support-matrix.ini\n'
+            '   :layout: chunked\n'
+            '   :chunk-size: 1\n',
+        )
+
+        with (
+            mock.patch.object(
+                support_matrix, 'load_support_matrix', return_value=shared
+            ),
+            mock.patch.object(
+                support_matrix.SharedMatrix,
+                '_feature',
+                autospec=True,
+                side_effect=support_matrix.SharedMatrix._feature,
+            ) as decode,
+        ):
+            self.build()
+
+        self.assertEqual(3, decode.call_count)
+
+
+class FindDirectivesTestCase(base.TestCase):
+    def test_find_directives(self):
+        directives = support_matrix.find_directives(
+            'Title\n'
+            '=====\n'
+            '\n'
+            '.. support_matrix:: support-matrix.ini\n'
+            '   :layout: auto\n'
+            '\n'
+            'Some text.\n'
+            '\n'
+            '  .. support_matrix_aggregate::\n'
+            '     :dedupe: title\n'
+            '\n'
+            '     compute\n'
+            '     storage.ini\n'
+            '\n'
+            '.. note:: Not ours.\n'
+        )
+
+        self.assertEqual(
+            [
+                (
+                    'support_matrix',
+                    4,
+                    ['support-matrix.ini'],
+                    {'layout': 'auto'},
+                    [],
+                ),
+                (
+                    'support_matrix_aggregate',
+                    9,
+                    [],
+                    {'dedupe': 'title'},
+                    ['compute', 'storage.ini'],
+                ),
+            ],
+            [
+                (d.name, d.lineno, d.arguments, d.options, d.content)
+                for d in directives
+            ],
+        )
+
+
+class SupportMatrixBuilderTestCase(base.SphinxTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.copy_fake_matrix()
+        self.write_file(
+            'conf.py',
+            "extensions = ['sphinx_feature_classification.support_matrix']\n"
+            "html_baseurl = 'https://docs.example.com/latest'\n",
+        )
+        self.write_file(
+            'index.rst',
+            'Support Matrix\n'
+            '==============\n'
+            '\n'
+            '.. support_matrix:: support-matrix.ini\n'
+            '   :layout: transposed\n',
+        )
+        self.write_file(
+            'other.rst',
+            ':orphan:\n\nOther\n=====\n',
+        )
+
+    def test_export(self):
+        _, warnings = self.build('supportmatrix')
+
+        self.assertEqual('', warnings)
+        # only the root document was read
+        doctrees = os.path.join(self.outdir, '.doctrees')
+        self.assertTrue(
+            os.path.exists(os.path.join(doctrees, 'index.doctree'))
+        )
+        self.assertFalse(
+            os.path.exists(os.path.join(doctrees, 'other.doctree'))
+        )
+
+        with open(os.path.join(self.outdir, 'support-matrix.json')) as fp:
+            exports = json.load(fp)
+
+        self.assertEqual(1, len(exports))
+        export = exports[0]
+        self.assertEqual('index', export['docname'])
+        self.assertEqual('support-matrix.ini', export['source'])
+        self.assertEqual({'layout': 'transposed'}, export['options'])
+        self.assertEqual(
+            [
+                (
+                    'driver.foo',
+                    'https://docs.example.com/latest/index.html#driver_foo',
+                ),
+                (
+                    'driver.bar',
+                    'https://docs.example.com/latest/index.html#driver_bar',
+                ),
+            ],
+            [(d['key'], d['url']) for d in export['drivers']],
+        )
+        feature = export['features'][0]
+        self.assertEqual('operation.Cool_Feature', feature['key'])
+        self.assertEqual(
+            {
+                'driver': 'driver.bar',
+                'status': 'partial',
+                'notes': 'Requires hardware support.',
+                'url': 'https://docs.example.com/latest/index.html'
+                '#operation_Cool_Feature_driver_bar',
+            },
+            feature['implementations'][1],
+        )
+
+        with open(os.path.join(self.outdir, 'support-matrix.csv')) as fp:
+            rows = list(csv.DictReader(fp))
+
+        self.assertEqual(
+            [
+                ('operation.Cool_Feature', 'driver.foo', 'complete'),
+                ('operation.Cool_Feature', 'driver.bar', 'partial'),
+            ],
+            [(r['feature'], r['driver'], r['status']) for r in rows],
+        )
+
+    def test_shared_doctrees(self):
+        outdir = os.path.join(self.outdir, 'sm')
+        app, warnings = self.build('supportmatrix', outdir)
+
+        self.assertEqual('', warnings)
+        self.assertEqual({'index'}, set(app.env.all_docs))
+
+        # the documents left unread are read by the HTML builder
+        app, warnings = self.build()
+
+        self.assertEqual('', warnings)
+        self.assertEqual({'index', 'other'}, set(app.env.all_docs))
+        self.assertTrue(
+            os.path.isfile(os.path.join(self.outdir, 'other.html'))
+        )
+
+        _, warnings = self.build('supportmatrix', outdir)
+
+        self.assertEqual('', warnings)
+        self.assertFalse(os.path.exists(os.path.join(outdir, '_static')))